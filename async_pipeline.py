@@ -0,0 +1,157 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlparse
+from auction_parser import build_listings
+from http_engine import EngineFallback
+from logger import setup_logger
+from metrics import metrics
+
+_DONE = object()
+_DAY_DONE = object()
+_COUNTY_DONE = object()
+
+
+class AsyncCrawlPipeline:
+    """Crawls counties as concurrent (county, month) and (county, day, page) tasks.
+
+    Parsed items are streamed to a single consumer stage that classifies them and
+    hands the listings to on_listing, so store and export writes overlap with network waits.
+    Pages of one day are fetched in order because the site keeps the current page
+    in the session, but pages of different days and counties run concurrently.
+    """
+
+    def __init__(self, engine, max_concurrency=16, per_host=2, months=3, tracker=None, checkpoint=None):
+        self.logger = setup_logger()
+        self.engine = engine
+        self.tracker = tracker
+        self.checkpoint = checkpoint
+        self.months = months
+        self.per_host = per_host
+        self._global_limit = asyncio.Semaphore(max_concurrency)
+        self._host_limits = {}
+        self._items = asyncio.Queue(maxsize=1000)
+        self.fallback_counties = []
+
+    async def _fetch(self, url, fn, *args):
+        """Runs one blocking engine request under the global and per-host limits"""
+        host = urlparse(url).netloc
+        host_limit = self._host_limits.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with self._global_limit, host_limit:
+            return await asyncio.to_thread(fn, *args)
+
+    async def crawl_day(self, website_link, county, auction_date):
+        session = self.engine.new_session()
+        day_url = self.engine.day_url(website_link, auction_date)
+        max_pages, items = await self._fetch(website_link, self.engine.fetch_first_page, website_link, auction_date, session)
+        metrics.count("days")
+        metrics.count("pages")
+        metrics.count("items", len(items))
+        print(f"{county} {auction_date:%B-%d-%Y} total pages: {max_pages}")
+        # Page 1 is passed on even when the rest of an unchanged day is skipped
+        await self._items.put((items, auction_date, county, day_url))
+        fingerprint = None
+        skip = False
+        if self.tracker is not None:
+            skip, fingerprint = await asyncio.to_thread(self.tracker.check, county, auction_date, max_pages, items)
+        if not skip:
+            for page_number in range(2, max_pages + 1):
+                items = await self._fetch(website_link, self.engine.fetch_next_page, website_link, session)
+                metrics.count("pages")
+                metrics.count("items", len(items))
+                await self._items.put((items, auction_date, county, day_url))
+        else:
+            fingerprint = None  # Still valid, nothing to save
+        # The consumer marks the day done and saves its fingerprint once it has written everything
+        # queued before this; saved any earlier, a crash would skip listings that never reached the store
+        await self._items.put((_DAY_DONE, auction_date, county, fingerprint))
+
+    async def crawl_county(self, county, website_link):
+        # Day tasks and to_thread calls started below inherit the county for the metrics
+        with metrics.for_county(county), metrics.timer("county"):
+            await self._crawl_county(county, website_link)
+
+    async def _crawl_county(self, county, website_link):
+        today = datetime.today().date()
+        day_tasks = {}
+        try:
+            url = website_link
+            session = self.engine.new_session()
+            # Each month's URL comes from the previous page, but days start as soon as they're found
+            for k in range(self.months):
+                dates, url = await self._fetch(website_link, self.engine.fetch_calendar_month, url, session)
+                for auction_date in dates:
+                    if self.checkpoint is not None and self.checkpoint.is_day_done(county, auction_date):
+                        continue  # Finished before the run was interrupted
+                    if auction_date >= today:
+                        day_tasks[auction_date] = asyncio.create_task(self.crawl_day(website_link, county, auction_date))
+                if url is None:
+                    break
+
+            results = await asyncio.gather(*day_tasks.values(), return_exceptions=True)
+            failed_days = 0
+            for auction_date, result in zip(day_tasks, results):
+                if isinstance(result, EngineFallback):
+                    raise result
+                if isinstance(result, Exception):
+                    failed_days += 1
+                    self.logger.error(f"Auction failed | County: {county} | Date: {auction_date:%B-%d-%Y} | Error: {str(result)}")
+            if failed_days:
+                # Not marked done: the county is neither swept nor skipped on --resume
+                self.logger.error(f"COUNTY INCOMPLETE: {county} | {failed_days} auction days failed")
+                metrics.count("county_failures")
+            else:
+                await self._items.put((_COUNTY_DONE, None, county, website_link))
+        except EngineFallback as e:
+            self.logger.info(f"{county}: falling back to Selenium ({str(e)})")
+            self.fallback_counties.append(county)
+        except Exception as e:
+            self.logger.error(f"COUNTY-WIDE FAILURE: {county} | URL: {website_link} | Error: {str(e)}", exc_info=True)
+            metrics.count("county_failures")
+        finally:
+            for task in day_tasks.values():
+                task.cancel()
+
+    async def consume(self, on_listing):
+        """Filters streamed items and passes listings on as they arrive"""
+        while True:
+            entry = await self._items.get()
+            if entry is _DONE:
+                break
+            items, auction_date, county, day_url = entry
+            if items is _DAY_DONE:
+                fingerprint = day_url  # Day entries carry the fingerprint in place of the URL
+                if fingerprint is not None and self.tracker is not None:
+                    await asyncio.to_thread(self.tracker.complete, county, auction_date, fingerprint)
+                if self.checkpoint is not None:
+                    await asyncio.to_thread(self.checkpoint.mark_day_done, county, auction_date)
+                continue
+            if items is _COUNTY_DONE:
+                if self.checkpoint is not None:
+                    await asyncio.to_thread(self.checkpoint.mark_county_done, county)
+                continue
+            for listing in build_listings(items, auction_date, county, day_url):
+                try:
+                    await asyncio.to_thread(on_listing, listing)
+                except Exception as e:
+                    self.logger.error(f"Listing consumer failed: {str(e)}", exc_info=True)
+
+    async def run(self, county_links, on_listing):
+        """county_links: {county: calendar_url}. Returns the counties that need the browser"""
+        consumer = asyncio.create_task(self.consume(on_listing))
+        await asyncio.gather(*(self.crawl_county(county, link) for county, link in county_links.items()))
+        await self._items.put(_DONE)
+        await consumer
+        return self.fallback_counties
+
+
+def run_pipeline(engine, county_links, on_listing, max_concurrency=16, per_host=2, months=3, tracker=None,
+                 checkpoint=None):
+    """Blocking entry point; returns the counties that have to be retried with Selenium"""
+    async def _run():
+        # to_thread's default pool is smaller than the concurrency we ask for
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=max_concurrency + 1))
+        pipeline = AsyncCrawlPipeline(engine, max_concurrency=max_concurrency, per_host=per_host, months=months,
+                                      tracker=tracker, checkpoint=checkpoint)
+        return await pipeline.run(county_links, on_listing)
+    return asyncio.run(_run())
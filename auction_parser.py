@@ -0,0 +1,200 @@
+from datetime import datetime
+from urllib.parse import urljoin
+from lxml import html as lxml_html
+from classifier import classifier
+
+
+def _has_class(name):
+    """XPath predicate matching one class in a space separated class attribute"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+CALENDAR_DAY_XPATH = f"//*[{_has_class('CALBOX')} and (@role='link' or {_has_class('CALSELF')})]"
+NEXT_MONTH_XPATH = f"//div[{_has_class('CALNAV')}]//a[starts-with(@aria-label, 'Next Month')]"
+AUCTION_ITEM_XPATH = f"//div[{_has_class('AUCTION_ITEM')}]"
+
+# The listing XHR endpoint compresses its markup with these substitutions
+RET_HTML_CODES = [
+    ("@A", '<div class="'), ("@B", "</div>"), ("@C", 'class="'), ("@D", "<div>"),
+    ("@E", "AUCTION"), ("@F", "</td><td"), ("@G", "</td></tr>"), ("@H", "<tr><td "),
+    ("@I", "table"), ("@J", 'p_back="NextCheck='), ("@K", 'style="Display:none"'),
+    ("@L", "/index.cfm?zaction=auction&zmethod=details&AID="),
+]
+
+def _text(element):
+    """Visible text of an element with whitespace collapsed, like WebElement.text"""
+    if element is None:
+        return ""
+    return " ".join(element.text_content().split())
+
+
+def _first(element, xpath):
+    found = element.xpath(xpath)
+    return found[0] if found else None
+
+
+def parse_html(page_html):
+    return lxml_html.fromstring(page_html)
+
+
+def decode_ret_html(ret_html):
+    """Expands the substitution codes used by the listing XHR responses"""
+    for code, replacement in RET_HTML_CODES:
+        ret_html = ret_html.replace(code, replacement)
+    return ret_html
+
+
+def parse_calendar_days(page_html):
+    """Returns the auction dates linked from a calendar page"""
+    tree = parse_html(page_html)
+    dates = []
+    for box in tree.xpath(CALENDAR_DAY_XPATH):
+        label = box.get("aria-label") or box.get("dayid")
+        if not label:
+            continue
+        for fmt in ("%B-%d-%Y", "%m/%d/%Y"):
+            try:
+                dates.append(datetime.strptime(label.strip(), fmt).date())
+                break
+            except ValueError:
+                continue
+    return dates
+
+
+def parse_next_month_url(page_html, page_url):
+    """Absolute URL of the calendar's 'Next Month' link, or None"""
+    tree = parse_html(page_html)
+    link = _first(tree, NEXT_MONTH_XPATH)
+    href = link.get("href") if link is not None else None
+    if not href or href.lower().startswith("javascript"):
+        return None
+    return urljoin(page_url, href)
+
+
+def parse_max_pages(page_html):
+    """Total page count shown in #maxWA, or None if the element is missing"""
+    tree = parse_html(page_html)
+    element = _first(tree, "//*[@id='maxWA']")
+    if element is None:
+        return None
+    try:
+        return int(_text(element))
+    except ValueError:
+        return None
+
+
+def parse_auction_items(page_html):
+    """Returns every AUCTION_ITEM on a listing page as plain data"""
+    tree = parse_html(page_html)
+    items = []
+    for auction in tree.xpath(AUCTION_ITEM_XPATH):
+        status_container = _first(auction, f".//div[{_has_class('AUCTION_STATS')}]")
+        status_label = _text(_first(status_container, f".//div[{_has_class('ASTAT_MSGA')}]")) if status_container is not None else ""
+        status_value = _text(_first(status_container, f".//div[{_has_class('ASTAT_MSGB')}]")) if status_container is not None else ""
+
+        cells = []
+        table = _first(auction, f".//table[{_has_class('ad_tab')}]")
+        if table is not None:
+            for row in table.xpath(".//tr"):
+                cell = _first(row, f".//td[{_has_class('AD_DTA')}]")
+                cells.append(_text(cell) if cell is not None else None)
+
+        items.append({
+            "item_id": auction.get("aid") or auction.get("id") or "",
+            "status_label": status_label,
+            "status_value": status_value,
+            "cells": cells,
+        })
+    return items
+
+
+def auction_status(status_label, status_value):
+    """Normalizes the two status elements into a single status string"""
+    if "Sold" in status_label:
+        return "Auction Sold"
+    if "Starts" in status_label or "Starts" in status_value:
+        return "Auction Starts"
+    if "Cancelled" in status_value:
+        return "Status Cancelled"
+    return ""
+
+
+def _money(text):
+    return text.replace("$", "").replace(",", "").strip()
+
+
+NOT_UPCOMING = "not an upcoming sale"
+INCOMPLETE = "incomplete listing"
+
+
+def _amount(text):
+    try:
+        return float(_money(text))
+    except (AttributeError, ValueError):
+        return None
+
+
+def read_listing(item, auction_date, county, link):
+    """Turns any parsed AUCTION_ITEM into a listing; fields the item doesn't have are None"""
+    cells = item["cells"]
+    complete = len(cells) >= 5 and not any(cell is None for cell in (cells[1], cells[3], *cells[-4:]))
+
+    listing = {
+        "date": auction_date.strftime("%m-%d-%Y"),  # Format date exactly as MM-DD-YYYY
+        "county": county,
+        "address": "",
+        "link": link,
+        "case_number": cells[1] if len(cells) > 1 else None,
+        "appraised_value": None,
+        "opening_bid": None,
+        "deposit": None,
+        "status": auction_status(item["status_label"], item["status_value"]),
+        "status_detail": item["status_value"],
+        "item_id": item["item_id"],
+    }
+    if complete:
+        # Last 3 rows are Appraised Value, Opening Bid, Deposit Requirement
+        appraised_value, opening_bid, deposit_requirement = cells[-3:]
+        # 4th row is the street, 4th last row is often city/state/zip
+        listing["address"] = f"{cells[3]} {cells[-4]}".strip()
+        listing["appraised_value"] = _amount(appraised_value)
+        listing["opening_bid"] = _amount(opening_bid)
+        listing["deposit"] = _money(deposit_requirement)
+    return listing
+
+
+def build_listings(items, auction_date, county, link):
+    """Every item on one page as a listing; upcoming sales are classified as a batch.
+
+    "tax_sale" is True or False for classified listings and None for the rest (sold,
+    cancelled or unreadable), with "reason" saying why either way.
+    """
+    listings = [read_listing(item, auction_date, county, link) for item in items]
+    upcoming = []
+    for item, listing in zip(items, listings):
+        listing["tax_sale"] = None
+        if item["status_label"] != "Auction Starts":
+            listing["reason"] = NOT_UPCOMING
+        elif listing["appraised_value"] is None or listing["opening_bid"] is None:
+            print(f"Could not parse values for {listing['address'][:50]}")
+            listing["reason"] = INCOMPLETE
+        else:
+            upcoming.append(listing)
+
+    if upcoming:
+        tax_sale, reasons = classifier.classify_listings(upcoming)
+        for listing, keep, reason in zip(upcoming, tax_sale, reasons):
+            listing["tax_sale"] = bool(keep)
+            listing["reason"] = reason
+    return listings
+
+
+if __name__ == "__main__":
+    # Quick check of the parser against saved pages: python auction_parser.py fixtures/auction_day.html
+    import sys
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as f:
+            page = f.read()
+        print(f"{path}: {len(parse_calendar_days(page))} calendar days, max pages {parse_max_pages(page)}")
+        for parsed in parse_auction_items(page):
+            print(parsed["item_id"], parsed["status_label"], "|", parsed["status_value"], "|", parsed["cells"])
@@ -0,0 +1,337 @@
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from logger import setup_logger
+from sheets_manager import create_auction_key
+
+
+# Rows imported from the sheet count as last seen before any run, so the usual sweep still
+# cancels the ones a fully scraped county no longer lists
+SEEDED_AT = "1970-01-01T00:00:00"
+
+# Classifier inputs kept so stored auctions can be reclassified; rows from older stores leave them NULL
+CLASSIFICATION_COLUMNS = {
+    "case_number": "TEXT", "appraised_value": "REAL", "opening_bid": "REAL", "deposit": "TEXT", "reason": "TEXT",
+}
+
+
+class AuctionStore:
+    """Local SQLite copy of every auction seen; the Google Sheet is synced from it"""
+
+    def __init__(self, db_path="auctions.db"):
+        self.logger = setup_logger()
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # Listings arrive from worker and pipeline threads
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS auctions (
+                    key TEXT PRIMARY KEY,
+                    auction_date TEXT NOT NULL,  -- ISO date so it sorts and compares as text
+                    county TEXT NOT NULL,
+                    address TEXT NOT NULL,
+                    link TEXT,
+                    status TEXT NOT NULL,        -- active, cancelled, expired or excluded (not a tax sale)
+                    first_seen TEXT NOT NULL,
+                    last_seen TEXT NOT NULL
+                )
+            """)
+            columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(auctions)")}
+            for column, column_type in CLASSIFICATION_COLUMNS.items():
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE auctions ADD COLUMN {column} {column_type}")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS store_meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS auctions_status_date ON auctions (status, auction_date)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS auctions_county_date ON auctions (county, auction_date)")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS day_fingerprints (
+                    county TEXT NOT NULL,
+                    auction_date TEXT NOT NULL,
+                    page_count INTEGER NOT NULL,
+                    item_count INTEGER NOT NULL,  -- items on the first page
+                    item_hash TEXT NOT NULL,      -- ids and statuses of the first page
+                    checked_at TEXT NOT NULL,     -- last full pagination walk
+                    PRIMARY KEY (county, auction_date)
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS county_runtimes (
+                    county TEXT PRIMARY KEY,
+                    seconds REAL NOT NULL,  -- smoothed over runs, used to balance shards
+                    updated TEXT NOT NULL
+                )
+            """)
+
+    def close(self):
+        self.conn.close()
+
+    def upsert(self, listing, seen_at):
+        """Records a classified listing found in this run; returns True the first time a key is seen.
+
+        Tax sales are stored active, other sales excluded with the classifier's reason so a
+        later reclassify can bring them back.
+        """
+        key = create_auction_key({"Auction Date": listing["date"], "County": listing["county"], "Address": listing["address"]})
+        auction_date = datetime.strptime(listing["date"], "%m-%d-%Y").date().isoformat()
+        status = "active" if listing.get("tax_sale", True) else "excluded"
+        with self._lock, self.conn:
+            # Checked before the write: a repeat sighting in the same run (retry, resume) is not new
+            known = self.conn.execute("SELECT 1 FROM auctions WHERE key = ?", (key,)).fetchone() is not None
+            self.conn.execute("""
+                INSERT INTO auctions (key, auction_date, county, address, link, status, first_seen, last_seen,
+                                      case_number, appraised_value, opening_bid, deposit, reason)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    link = excluded.link, status = excluded.status, last_seen = excluded.last_seen,
+                    case_number = excluded.case_number, appraised_value = excluded.appraised_value,
+                    opening_bid = excluded.opening_bid, deposit = excluded.deposit, reason = excluded.reason
+            """, (key, auction_date, listing["county"], listing["address"], listing["link"], status, seen_at, seen_at,
+                  listing.get("case_number"), listing.get("appraised_value"), listing.get("opening_bid"),
+                  listing.get("deposit"), listing.get("reason")))
+        return not known
+
+    def needs_seed(self):
+        """True until the sheet's existing rows have been imported into this store"""
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM store_meta WHERE name = 'seeded_from_sheet'").fetchone() is None
+
+    def seed_from_sheet(self, records, today=None):
+        """Imports the sheet's upcoming rows so the first sync doesn't delete what this store never saw.
+
+        Keeps auctions of counties that fail or aren't scraped on the first run, or after the
+        store cache was lost. Returns the number of rows imported.
+        """
+        today = (today or datetime.now().date()).isoformat()
+        rows = []
+        for record in records:
+            try:
+                key = create_auction_key(record)
+                auction_date = datetime.strptime(str(record["Auction Date"]).strip(), "%m-%d-%Y").date().isoformat()
+            except (ValueError, KeyError):
+                continue
+            if auction_date >= today:
+                rows.append((key, auction_date, str(record["County"]).strip().lower(), str(record["Address"]),
+                             record.get("Link"), SEEDED_AT, SEEDED_AT))
+        with self._lock, self.conn:
+            imported = self.conn.executemany("""
+                INSERT OR IGNORE INTO auctions (key, auction_date, county, address, link, status, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, 'active', ?, ?)
+            """, rows).rowcount
+            self.conn.execute("INSERT OR REPLACE INTO store_meta (name, value) VALUES ('seeded_from_sheet', ?)",
+                              (datetime.now().isoformat(timespec="seconds"),))
+        self.logger.info(f"Store: seeded {imported} auctions from the sheet")
+        return imported
+
+    def get_fingerprint(self, county, auction_date):
+        """(page_count, item_count, item_hash, checked_at) from the last full walk of a day, or None"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT page_count, item_count, item_hash, checked_at FROM day_fingerprints WHERE county = ? AND auction_date = ?",
+                (county, auction_date.isoformat())
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def save_fingerprint(self, county, auction_date, fingerprint, checked_at):
+        page_count, item_count, item_hash = fingerprint
+        with self._lock, self.conn:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO day_fingerprints (county, auction_date, page_count, item_count, item_hash, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (county, auction_date.isoformat(), page_count, item_count, item_hash, checked_at))
+
+    def touch_day(self, county, auction_date, seen_at):
+        """Marks the stored auctions (active and excluded) of an unchanged day as seen in this run; returns their keys"""
+        with self._lock, self.conn:
+            keys = [row["key"] for row in self.conn.execute(
+                "SELECT key FROM auctions WHERE county = ? AND auction_date = ? AND status IN ('active', 'excluded')",
+                (county, auction_date.isoformat())
+            )]
+            self.conn.executemany("UPDATE auctions SET last_seen = ? WHERE key = ?", [(seen_at, key) for key in keys])
+        return keys
+
+    def finish_run(self, run_started, counties=None, today=None):
+        """Expires past auctions and cancels active or excluded ones this run didn't see again.
+
+        When counties is given, only auctions in those (fully scraped) counties are cancelled.
+        """
+        today = (today or datetime.now().date()).isoformat()
+        with self._lock, self.conn:
+            expired = self.conn.execute(
+                "UPDATE auctions SET status = 'expired' WHERE status != 'expired' AND auction_date < ?", (today,)
+            ).rowcount
+            if counties is None:
+                cancelled = self.conn.execute(
+                    "UPDATE auctions SET status = 'cancelled' WHERE status IN ('active', 'excluded') AND last_seen < ?",
+                    (run_started,)
+                ).rowcount
+            else:
+                counties = sorted(counties)
+                cancelled = self.conn.execute(
+                    "UPDATE auctions SET status = 'cancelled' WHERE status IN ('active', 'excluded') AND last_seen < ? "
+                    f"AND county IN ({', '.join('?' * len(counties))})", (run_started, *counties)
+                ).rowcount
+        self.logger.info(f"Store: {expired} auctions expired, {cancelled} cancelled or withdrawn")
+        return expired, cancelled
+
+    def reclassify(self, classifier):
+        """Re-applies the tax sale rules to stored auctions without scraping them again.
+
+        Active auctions that no longer qualify become excluded and excluded ones that qualify
+        again become active. Returns (excluded, restored).
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT key, county, appraised_value, opening_bid, deposit, status FROM auctions "
+                "WHERE status IN ('active', 'excluded') AND appraised_value IS NOT NULL"
+            ).fetchall()
+        if not rows:
+            return 0, 0
+
+        tax_sale, reasons = classifier.classify([row["appraised_value"] for row in rows],
+                                                [row["opening_bid"] for row in rows],
+                                                [row["deposit"] for row in rows],
+                                                [row["county"] for row in rows])
+        updates = [("active" if keep else "excluded", reason, row["key"])
+                   for row, keep, reason in zip(rows, tax_sale, reasons)
+                   if (row["status"] == "active") != bool(keep)]
+        with self._lock, self.conn:
+            self.conn.executemany("UPDATE auctions SET status = ?, reason = ? WHERE key = ?", updates)
+        restored = sum(1 for status, reason, key in updates if status == "active")
+        self.logger.info(f"Store: {len(updates) - restored} auctions excluded, {restored} restored by the current rules")
+        return len(updates) - restored, restored
+
+    def save_runtimes(self, seconds_by_county, updated):
+        """Folds this run's scrape time per county into the history (average with the previous value)"""
+        with self._lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO county_runtimes (county, seconds, updated) VALUES (?, ?, ?)
+                ON CONFLICT (county) DO UPDATE SET
+                    seconds = (seconds + excluded.seconds) / 2, updated = excluded.updated
+            """, [(county, seconds, updated) for county, seconds in seconds_by_county.items()])
+
+    def county_runtimes(self):
+        """{county: typical seconds to scrape it}"""
+        with self._lock:
+            return {row["county"]: row["seconds"] for row in self.conn.execute("SELECT county, seconds FROM county_runtimes")}
+
+    def seen_since(self, seen_at, counties):
+        """Active and excluded auctions in counties that were scraped or touched at or after seen_at, as dicts"""
+        counties = sorted(counties)
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(
+                "SELECT * FROM auctions WHERE status IN ('active', 'excluded') AND last_seen >= ? "
+                f"AND county IN ({', '.join('?' * len(counties))})",
+                (seen_at, *counties)
+            )]
+
+    def fingerprints_since(self, checked_at, counties):
+        """Day fingerprints in counties saved at or after checked_at, as dicts"""
+        counties = sorted(counties)
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(
+                f"SELECT * FROM day_fingerprints WHERE checked_at >= ? AND county IN ({', '.join('?' * len(counties))})",
+                (checked_at, *counties)
+            )]
+
+    def import_auctions(self, rows, seen_at):
+        """Upserts auction rows exported by another store (a shard) as seen at seen_at, keeping their status"""
+        with self._lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO auctions (key, auction_date, county, address, link, status, first_seen, last_seen,
+                                      case_number, appraised_value, opening_bid, deposit, reason)
+                VALUES (:key, :auction_date, :county, :address, :link, :status, :first_seen, :seen_at,
+                        :case_number, :appraised_value, :opening_bid, :deposit, :reason)
+                ON CONFLICT (key) DO UPDATE SET
+                    link = excluded.link, status = excluded.status, last_seen = excluded.last_seen,
+                    case_number = COALESCE(excluded.case_number, case_number),
+                    appraised_value = COALESCE(excluded.appraised_value, appraised_value),
+                    opening_bid = COALESCE(excluded.opening_bid, opening_bid),
+                    deposit = COALESCE(excluded.deposit, deposit), reason = COALESCE(excluded.reason, reason)
+            """, [{**{column: None for column in CLASSIFICATION_COLUMNS}, "status": "active", **row, "seen_at": seen_at}
+                  for row in rows])
+
+    def import_fingerprints(self, rows):
+        with self._lock, self.conn:
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO day_fingerprints (county, auction_date, page_count, item_count, item_hash, checked_at)
+                VALUES (:county, :auction_date, :page_count, :item_count, :item_hash, :checked_at)
+            """, rows)
+
+    def active_auctions(self):
+        """Rows the sheet should show, oldest auction first"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT * FROM auctions WHERE status = 'active' ORDER BY auction_date, county, address"
+            ).fetchall()
+
+
+def day_fingerprint(max_pages, items):
+    """Cheap summary of an auction day from its page count and first page of items"""
+    digest = hashlib.sha1()
+    for item in sorted(items, key=lambda item: item["item_id"]):
+        digest.update(f"{item['item_id']}|{item['status_label']}|{item['status_value']}\n".encode("utf-8"))
+    return max_pages, len(items), digest.hexdigest()
+
+
+class DayTracker:
+    """Decides whether an auction day needs its full pagination walk (incremental mode).
+
+    A day is skipped when its page count and first page match the fingerprint saved after
+    the last full walk, which is at most max_age_days old. The auctions stored for a skipped
+    day are marked as seen so the cancellation step still treats them as active.
+    """
+
+    def __init__(self, store, seen_at, max_age_days=7):
+        self.store = store
+        self.seen_at = seen_at
+        self.max_age_days = max_age_days
+
+    def check(self, county, auction_date, max_pages, items):
+        """Returns (True if the rest of the day can be skipped, fingerprint of the first page)"""
+        fingerprint = day_fingerprint(max_pages, items)
+        saved = self.store.get_fingerprint(county, auction_date)
+        if saved is None or tuple(saved[:3]) != fingerprint:
+            return False, fingerprint
+        age = datetime.fromisoformat(self.seen_at) - datetime.fromisoformat(saved[3])
+        if age.days >= self.max_age_days:
+            return False, fingerprint
+
+        keys = self.store.touch_day(county, auction_date, self.seen_at)
+        print(f"Unchanged since {saved[3]}, skipped: {county} {auction_date:%B-%d-%Y} ({len(keys)} auctions)")
+        return True, fingerprint
+
+    def complete(self, county, auction_date, fingerprint):
+        """Call once every page of the day has been processed"""
+        self.store.save_fingerprint(county, auction_date, fingerprint, self.seen_at)
+
+
+def sync_to_sheet(store, sheets):
+    """Pushes the difference between the store's active auctions and the sheet.
+
+    Only rows that are missing from the sheet are appended and only rows that are no
+    longer active are deleted, so an unchanged run costs one sheet read and no writes.
+    """
+    if store.needs_seed():
+        store.seed_from_sheet(sheets.get_auction_records())
+    desired = {row["key"]: row for row in store.active_auctions()}
+    existing = sheets.get_existing_auctions()  # {key: row_num}
+
+    # Deletions first: the row numbers come from the read above
+    rows_to_delete = [row_num for key, row_num in existing.items() if key not in desired]
+    sheets.remove_rows(rows_to_delete)
+
+    added = 0
+    for key, row in desired.items():
+        if key in existing:
+            continue
+        auction_date = datetime.strptime(row["auction_date"], "%Y-%m-%d").strftime("%m-%d-%Y")
+        if sheets.add_auction(date=auction_date, county=row["county"], address=row["address"], link=row["link"]):
+            added += 1
+    sheets.flush()
+    return added, len(rows_to_delete)
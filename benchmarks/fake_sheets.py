@@ -0,0 +1,89 @@
+"""In-memory stand-in for the parts of the gspread Worksheet API that SheetsManager uses"""
+import random
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+HEADER = ["Auction Date", "County", "Address", "Link"]
+
+
+class FakeSpreadsheet:
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+
+    def batch_update(self, body):
+        self.worksheet._api("batch_update")
+        for request in body["requests"]:
+            if "deleteDimension" in request:
+                grid = request["deleteDimension"]["range"]
+                del self.worksheet.rows[grid["startIndex"]:grid["endIndex"]]
+            # repeatCell (formatting) requests don't change values
+        return {"replies": [{} for _ in body["requests"]]}
+
+
+class FakeWorksheet:
+    """Rows live in a list (header first); every call counts as one API call and waits latency seconds"""
+
+    def __init__(self, rows=None, latency=0.0):
+        self.rows = [list(HEADER)] + [list(row) for row in rows or []]
+        self.latency = latency
+        self.api_calls = Counter()
+        self.id = 0
+        self.title = "Sheet1"
+        self.spreadsheet = FakeSpreadsheet(self)
+
+    def _api(self, name):
+        self.api_calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def row_values(self, row):
+        self._api("row_values")
+        return list(self.rows[row - 1]) if row <= len(self.rows) else []
+
+    def get_all_values(self):
+        self._api("get_all_values")
+        return [list(row) for row in self.rows]
+
+    def get_all_records(self):
+        self._api("get_all_records")
+        header = self.rows[0]
+        return [dict(zip(header, row)) for row in self.rows[1:]]
+
+    def append_rows(self, values, **kwargs):
+        self._api("append_rows")
+        first_row = len(self.rows) + 1
+        self.rows.extend(list(row) for row in values)
+        return {"updates": {"updatedRange": f"{self.title}!A{first_row}:D{len(self.rows)}"}}
+
+    def append_row(self, values, **kwargs):
+        self._api("append_row")
+        first_row = len(self.rows) + 1
+        self.rows.append(list(values))
+        return {"updates": {"updatedRange": f"{self.title}!A{first_row}:D{first_row}"}}
+
+    def delete_rows(self, start_index, end_index=None):
+        self._api("delete_rows")
+        del self.rows[start_index - 1:end_index or start_index]
+
+    def sort(self, *specs, **kwargs):
+        self._api("sort")
+        column, order = specs[0]
+        self.rows[1:] = sorted(self.rows[1:], key=lambda row: row[column - 1], reverse=order == "des")
+
+    def freeze(self, rows=None, cols=None):
+        self._api("freeze")
+
+
+def synthetic_rows(count, counties, expired_share=0.1, seed=1):
+    """Sheet rows spread over the next 90 days, with some already in the past"""
+    rng = random.Random(seed)
+    today = date.today()
+    rows = []
+    for i in range(count):
+        offset = -rng.randrange(1, 30) if rng.random() < expired_share else rng.randrange(1, 90)
+        county = counties[i % len(counties)]
+        rows.append([(today + timedelta(days=offset)).strftime("%m-%d-%Y"), county,
+                     f"{i} {rng.choice(['MAIN', 'OAK', 'ELM'])} ST {county.upper()}, 4{rng.randrange(3000, 5999)}",
+                     f"https://{county}.example/index.cfm?case={i}"])
+    return rows
@@ -0,0 +1,169 @@
+"""Local stand-in for the county sheriff sale sites, serving synthetic calendar and listing pages.
+
+URLs mirror the real site under a per-county prefix, e.g.
+http://127.0.0.1:8765/adams/index.cfm?zaction=USER&zmethod=CALENDAR
+"""
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class MockSiteConfig:
+    def __init__(self, days_per_month=2, pages_per_day=3, items_per_page=20, months=3, latency=0.0, seed=1):
+        self.days_per_month = days_per_month
+        self.pages_per_day = pages_per_day
+        self.items_per_page = items_per_page
+        self.months = months
+        self.latency = latency  # seconds added to every response
+        self.seed = seed
+
+
+def _month_start(offset):
+    today = date.today()
+    month = today.month - 1 + offset
+    return date(today.year + month // 12, month % 12 + 1, 1)
+
+
+def auction_days(month_start, config):
+    """Future auction days in a month, spread a week apart"""
+    days = []
+    day = max(month_start, date.today() + timedelta(days=1))
+    while len(days) < config.days_per_month and day.month == month_start.month:
+        days.append(day)
+        day += timedelta(days=7)
+    return days
+
+
+def render_item(county, auction_date, page, index, config):
+    """One AUCTION_ITEM; roughly half are mortgage sales (2/3 opening bid) that the filter drops"""
+    rng = random.Random(f"{config.seed}-{county}-{auction_date}-{page}-{index}")
+    aid = f"{auction_date:%m%d}{page:02d}{index:03d}"
+    appraised = rng.randrange(30, 400) * 1000
+    if rng.random() < 0.5:
+        opening_bid, deposit = round(2 / 3 * appraised, 2), rng.choice([2000, 5000, 10000])
+    else:
+        opening_bid, deposit = rng.randrange(500, 20000) + 0.55, 2000
+    status_label, status_value = ("Auction Starts", f"{auction_date:%m/%d/%Y} 09:01 AM ET")
+    if rng.random() < 0.1:
+        status_label, status_value = "Auction Status", "Cancelled per Plaintiff"
+    rows = [
+        ("Auction Type:", "SHERIFF SALE"),
+        ("Case #:", f"CV-{auction_date:%y}-{aid}"),
+        ("Parcel ID:", f"{rng.randrange(100, 999)}-{rng.randrange(10, 99)}-{rng.randrange(1000, 9999)}"),
+        ("Property Address:", f"{rng.randrange(1, 9999)} {rng.choice(['MAIN', 'OAK', 'ELM', 'HIGH', 'PARK'])} {rng.choice(['STREET', 'AVE', 'RD', 'DR'])}"),
+        ("", f"{county.upper()}, 4{rng.randrange(3000, 5999)}"),
+        ("Appraised Value:", f"${appraised:,.2f}"),
+        ("Opening Bid:", f"${opening_bid:,.2f}"),
+        ("Deposit Requirement:", f"${deposit:,.2f}"),
+    ]
+    table = "".join(f'<tr><th class="AD_LBL">{label}</th><td class="AD_DTA">{value}</td></tr>' for label, value in rows)
+    return (f'<div class="AUCTION_ITEM PREVIEW" id="AITEM_{aid}" aid="{aid}">'
+            f'<div class="AUCTION_STATS"><div class="ASTAT_MSGA ASTAT_LBL">{status_label}</div>'
+            f'<div class="ASTAT_MSGB Astat_DATA">{status_value}</div></div>'
+            f'<div class="AUCTION_DETAILS"><table class="ad_tab">{table}</table></div></div>')
+
+
+def render_items(county, auction_date, page, config):
+    return "".join(render_item(county, auction_date, page, i, config) for i in range(config.items_per_page))
+
+
+def render_calendar(county, offset, config):
+    month_start = _month_start(offset)
+    boxes = "".join(
+        f'<div class="CALBOX CALW5" role="link" tabindex="0" dayid="{day:%m/%d/%Y}" aria-label="{day:%B-%d-%Y}" '
+        f'onclick="location.href=\'index.cfm?zaction=AUCTION&amp;Zmethod=PREVIEW&amp;AuctionDate={day:%m/%d/%Y}\'">'
+        f'<span class="CALNUM">{day.day}</span></div>'
+        for day in auction_days(month_start, config)
+    )
+    next_link = ""
+    if offset + 1 < config.months:
+        next_link = (f'<a href="index.cfm?zaction=USER&amp;zmethod=CALENDAR&amp;offset={offset + 1}" '
+                     f'aria-label="Next Month - {_month_start(offset + 1):%B %Y}">&gt;</a>')
+    return (f'<html><body><div class="CALNAV"><div class="CALTITLE">{month_start:%B %Y}</div>{next_link}</div>'
+            f'<div class="CALDAYBOX">{boxes}</div></body></html>')
+
+
+def render_preview(county, auction_date, page, config):
+    next_page = ""
+    if page < config.pages_per_day:
+        next_page = (f'<img src="arrow_right.gif" onclick="location.href=\'index.cfm?zaction=AUCTION&amp;Zmethod=PREVIEW'
+                     f'&amp;AuctionDate={auction_date:%m/%d/%Y}&amp;page={page + 1}\'">')
+    return (f'<html><body><div class="Head_W"><div class="PageFrame">Page {page} of '
+            f'<span id="maxWA">{config.pages_per_day}</span><span class="PageRight">{next_page}</span></div></div>'
+            f'<div id="Area_W">{render_items(county, auction_date, page, config)}</div></body></html>')
+
+
+class MockSiteHandler(BaseHTTPRequestHandler):
+    config = MockSiteConfig()
+    sessions = {}  # {session id: (auction_date, current page)}
+    sessions_lock = threading.Lock()
+    request_count = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body, content_type="text/html", cookie=None):
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        if cookie:
+            self.send_header("Set-Cookie", f"CFID={cookie}; Path=/")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _session_id(self):
+        for part in self.headers.get("Cookie", "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "CFID":
+                return value
+        return None
+
+    def do_GET(self):
+        config = self.config
+        with self.sessions_lock:
+            MockSiteHandler.request_count += 1
+        if config.latency:
+            time.sleep(config.latency)
+
+        url = urlparse(self.path)
+        county = url.path.strip("/").split("/")[0]
+        query = {key.lower(): values[0] for key, values in parse_qs(url.query).items()}
+        action, method = query.get("zaction", "").upper(), query.get("zmethod", "").upper()
+
+        if action == "USER" and method == "CALENDAR":
+            self._send(render_calendar(county, int(query.get("offset", 0)), config))
+        elif action == "AUCTION" and method == "PREVIEW":
+            month, day, year = (int(part) for part in query["auctiondate"].split("/"))
+            auction_date, page = date(year, month, day), int(query.get("page", 1))
+            session_id = self._session_id() or uuid.uuid4().hex
+            with self.sessions_lock:
+                self.sessions[session_id] = (county, auction_date, page)
+            self._send(render_preview(county, auction_date, page, config), cookie=session_id)
+        elif action == "AUCTION" and method == "UPDATE":
+            with self.sessions_lock:
+                county, auction_date, page = self.sessions.get(self._session_id(), (county, date.today(), 1))
+                page = min(config.pages_per_day, page + int(query.get("pagedir", 0)))
+                self.sessions[self._session_id()] = (county, auction_date, page)
+            # Compressed the same way as the real endpoint
+            ret_html = render_items(county, auction_date, page, config).replace('<div class="', "@A").replace("</div>", "@B")
+            self._send(json.dumps({"retHTML": ret_html}), content_type="application/json")
+        else:
+            self.send_error(404)
+
+
+def start_mock_site(config, port=0):
+    """Starts the server on a background thread; returns (server, base_url)"""
+    handler = type("ConfiguredHandler", (MockSiteHandler,), {"config": config, "sessions": {}})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def county_calendar_url(base_url, county):
+    return f"{base_url}/{county}/index.cfm?zaction=USER&zmethod=CALENDAR"
@@ -0,0 +1,220 @@
+"""Offline benchmarks for the scrapers and SheetsManager.
+
+Run from the repository root, e.g.
+    python -m benchmarks.run_benchmarks --counties 10 --pages 5 --items 20 --latency 0.05
+    python -m benchmarks.run_benchmarks --scenario sheets --sheet-rows 20000
+Add --selenium to also drive scrapeData through Chrome against the mock site.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+
+from async_pipeline import run_pipeline
+from auction_store import AuctionStore, sync_to_sheet
+from benchmarks.fake_sheets import FakeWorksheet, synthetic_rows
+from benchmarks.mock_site import MockSiteConfig, MockSiteHandler, county_calendar_url, start_mock_site
+from http_engine import HttpEngine
+from metrics import metrics, percentile
+from sheets_manager import SheetsManager
+
+SCENARIOS = ["http", "async", "sheets"]
+
+
+def latency_stats(values):
+    values = sorted(values)
+    return {
+        "calls": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+
+
+def scrape_result(name, elapsed, listings, requests_before):
+    run = metrics.report()
+    counters = Counter()
+    for data in run["counties"].values():
+        counters.update(data["counters"])
+    http_times = sorted(metrics.timings.get("http.get", []))
+    return {
+        "scenario": name,
+        "seconds": round(elapsed, 3),
+        "days": counters["days"],
+        "pages": counters["pages"],
+        "items": counters["items"],
+        "listings": sum(1 for listing in listings if listing["tax_sale"]),
+        "pages_per_s": round(counters["pages"] / elapsed, 2),
+        "items_per_s": round(counters["items"] / elapsed, 2),
+        "requests": MockSiteHandler.request_count - requests_before,
+        "request_latency": latency_stats(http_times),
+    }
+
+
+def bench_http(base_url, counties):
+    metrics.reset()
+    engine = HttpEngine()
+    listings = []
+    before = MockSiteHandler.request_count
+    start = time.perf_counter()
+    for county in counties:
+        with metrics.for_county(county):
+            engine.scrape_county(county_calendar_url(base_url, county), county, listings.append)
+    return scrape_result("scrape_http", time.perf_counter() - start, listings, before)
+
+
+def bench_async(base_url, counties, concurrency, per_host):
+    metrics.reset()
+    listings = []
+    before = MockSiteHandler.request_count
+    start = time.perf_counter()
+    run_pipeline(HttpEngine(pool_size=concurrency), {county: county_calendar_url(base_url, county) for county in counties},
+                 listings.append, max_concurrency=concurrency, per_host=per_host)
+    return scrape_result("scrape_async", time.perf_counter() - start, listings, before)
+
+
+def bench_selenium(base_url, counties):
+    # Imported here so the other scenarios don't need Chrome
+    import main
+    metrics.reset()
+    listings = []
+    before = MockSiteHandler.request_count
+    browser = main.BrowserSession()
+    start = time.perf_counter()
+    try:
+        for county in counties:
+            with metrics.for_county(county):
+                main.scrapeData(browser, county_calendar_url(base_url, county), county, listings.append)
+    finally:
+        browser.quit()
+    result = scrape_result("scrape_selenium", time.perf_counter() - start, listings, before)
+    result["page_load_latency"] = latency_stats(sorted(metrics.timings.get("wait.maxWA", [])))
+    return result
+
+
+def timed(results, name, sheet, fn, *args, **kwargs):
+    """Runs one SheetsManager method and records its latency and the API calls it made"""
+    calls_before = Counter(sheet.api_calls)
+    start = time.perf_counter()
+    value = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    entry = results.setdefault(name, {"durations": [], "api_calls": Counter()})
+    entry["durations"].append(elapsed)
+    entry["api_calls"].update(sheet.api_calls - calls_before)
+    return value
+
+
+def bench_sheets(sheet_rows, new_listings, counties, api_latency, unbatched_listings):
+    counties = counties or ["adams"]
+    # limiter=None: measure the code, not the sleeps that hold the real API to its quota
+    new_rows = [[row[0], row[1], f"NEW {row[2]}", row[3]] for row in synthetic_rows(new_listings, counties, expired_share=0, seed=2)]
+    methods = {}
+
+    # Batch mode: one read, buffered appends, one flush
+    sheet = FakeWorksheet(synthetic_rows(sheet_rows, counties), latency=api_latency)
+    sheets = SheetsManager.from_worksheet(sheet, batch_mode=True, limiter=None)
+    timed(methods, "remove_expired_auctions", sheet, sheets.remove_expired_auctions)
+    timed(methods, "get_existing_auctions", sheet, sheets.get_existing_auctions)
+    for row in new_rows + new_rows[: len(new_rows) // 10]:  # Include some duplicates
+        timed(methods, "add_auction[batch]", sheet, sheets.add_auction, *row)
+    timed(methods, "flush", sheet, sheets.flush)
+    existing = timed(methods, "get_existing_auctions", sheet, sheets.get_existing_auctions)
+    timed(methods, "remove_rows", sheet, sheets.remove_rows, list(existing.values())[::20])
+    batch_calls = sum(sheet.api_calls.values())
+
+    # Unbatched add_auction on a copy of the same sheet, limited because every call writes, formats and sorts
+    sheet = FakeWorksheet(synthetic_rows(sheet_rows, counties), latency=api_latency)
+    sheets = SheetsManager.from_worksheet(sheet, limiter=None)
+    for row in new_rows[:unbatched_listings]:
+        timed(methods, "add_auction[unbatched]", sheet, sheets.add_auction, *row)
+
+    # Store to sheet sync
+    sheet = FakeWorksheet(synthetic_rows(sheet_rows, counties), latency=api_latency)
+    sheets = SheetsManager.from_worksheet(sheet, batch_mode=True, limiter=None)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AuctionStore(os.path.join(tmp, "bench.db"))
+        run_started = "1970-01-01T00:00:00"
+        for row in sheet.rows[1:] + new_rows:
+            store.upsert({"date": row[0], "county": row[1], "address": row[2], "link": row[3]}, run_started)
+        store.finish_run(run_started)
+        timed(methods, "sync_to_sheet", sheet, sync_to_sheet, store, sheets)
+        store.close()
+
+    return {
+        "scenario": "sheets",
+        "sheet_rows": sheet_rows,
+        "new_listings": new_listings,
+        "batch_run_api_calls": batch_calls,
+        "methods": {
+            name: {**latency_stats(sorted(entry["durations"])), "api_calls": dict(entry["api_calls"])}
+            for name, entry in methods.items()
+        },
+    }
+
+
+def print_result(result):
+    print(f"\n== {result['scenario']} ==")
+    for key, value in result.items():
+        if key == "methods":
+            for method, stats in value.items():
+                print(f"  {method:<28} {json.dumps(stats)}")
+        elif key != "scenario":
+            print(f"  {key:<20} {json.dumps(value)}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline scraper and SheetsManager benchmarks")
+    parser.add_argument("--scenario", choices=SCENARIOS + ["all"], default="all")
+    parser.add_argument("--selenium", action="store_true", help="Also benchmark scrapeData in Chrome (needs chromedriver)")
+    parser.add_argument("--counties", type=int, default=10)
+    parser.add_argument("--days", type=int, default=2, help="Auction days per month per county")
+    parser.add_argument("--months", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=3, help="Pages per auction day")
+    parser.add_argument("--items", type=int, default=20, help="Items per page")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds added to every mock site response")
+    parser.add_argument("--concurrency", type=int, default=16)
+    # Every mock county is served from the same host, so this caps the whole async run
+    parser.add_argument("--per-host", type=int, default=16)
+    parser.add_argument("--sheet-rows", type=int, default=5000, help="Rows already in the fake sheet")
+    parser.add_argument("--new-listings", type=int, default=500)
+    parser.add_argument("--unbatched-listings", type=int, default=20)
+    parser.add_argument("--api-latency", type=float, default=0.0, help="Seconds added to every fake Sheets API call")
+    parser.add_argument("--json", help="Also write the results to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    counties = [f"county{n:02d}" for n in range(1, args.counties + 1)]
+    scenarios = SCENARIOS if args.scenario == "all" else [args.scenario]
+    results = []
+
+    if {"http", "async"} & set(scenarios) or args.selenium:
+        config = MockSiteConfig(days_per_month=args.days, pages_per_day=args.pages, items_per_page=args.items,
+                                months=args.months, latency=args.latency)
+        server, base_url = start_mock_site(config)
+        try:
+            if "http" in scenarios:
+                results.append(bench_http(base_url, counties))
+            if "async" in scenarios:
+                results.append(bench_async(base_url, counties, args.concurrency, args.per_host))
+            if args.selenium:
+                results.append(bench_selenium(base_url, counties))
+        finally:
+            server.shutdown()
+
+    if "sheets" in scenarios:
+        results.append(bench_sheets(args.sheet_rows, args.new_listings, counties, args.api_latency, args.unbatched_listings))
+
+    for result in results:
+        print_result(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
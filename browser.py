@@ -0,0 +1,107 @@
+import os
+import threading
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from webdriver_manager.chrome import ChromeDriverManager
+from logger import setup_logger
+from metrics import metrics
+os.environ['WDM_LOG_LEVEL'] = '1'  # 0=Silent, 1=Errors, 2=Warnings, 3=Info
+
+# Listings only need the HTML and the site's own scripts; everything else is render cost
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.css",
+]
+
+
+def build_chrome_options(block_resources=True):
+    """Chrome options shared by every browser worker"""
+    options = webdriver.ChromeOptions()
+    if os.environ.get("CHROME_BIN"):
+        options.binary_location = os.environ["CHROME_BIN"]  # The Chrome that CHROMEDRIVER_PATH was built for
+    # Headless configuration
+    options.add_argument("--headless=new")  # Modern headless mode
+    options.add_argument("--no-sandbox")  # Essential for CI/CD
+    options.add_argument("--disable-dev-shm-usage")  # Prevents memory issues
+    options.add_argument("--disable-gpu")  # Recommended for headless
+    options.add_argument("--window-size=1920,1080")  # Virtual display size
+
+    # Anti-detection settings
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+
+    if block_resources:
+        # Don't wait for blocked subresources before handing the page back
+        options.page_load_strategy = "eager"
+        options.add_argument("--blink-settings=imagesEnabled=false")
+    return options
+
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def get_driver_path():
+    """Resolves the chromedriver binary on first use; every worker then starts its own Chrome from it.
+
+    CHROMEDRIVER_PATH skips webdriver-manager entirely (CI sets it, with CHROME_BIN, from the
+    setup-chrome step). Otherwise CHROMEDRIVER_VERSION pins the version webdriver-manager fetches.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            with metrics.timer("driver.install"):
+                _driver_path = os.environ.get("CHROMEDRIVER_PATH") or ChromeDriverManager(
+                    driver_version=os.environ.get("CHROMEDRIVER_VERSION")).install()
+        return _driver_path
+
+
+def create_driver(block_resources=True):
+    """Starts an isolated Chrome session for one worker"""
+    with metrics.timer("driver.startup"):
+        driver = webdriver.Chrome(service=ChromeService(get_driver_path()), options=build_chrome_options(block_resources))
+        if block_resources:
+            # Requests matching these patterns fail inside the browser and never hit the network
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
+
+
+class BrowserSession:
+    """One worker's Chrome, restarted after recycle_pages listing pages to keep its memory bounded"""
+
+    def __init__(self, recycle_pages=200, block_resources=True):
+        self.logger = setup_logger()
+        self.recycle_pages = recycle_pages
+        self.block_resources = block_resources
+        self.pages = 0
+        self._driver = None
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = create_driver(self.block_resources)
+            self.pages = 0
+        return self._driver
+
+    def count_page(self):
+        self.pages += 1
+
+    def recycle_if_due(self):
+        """Restarts Chrome once it has rendered enough pages; only call between auction days"""
+        if self._driver is not None and self.recycle_pages and self.pages >= self.recycle_pages:
+            self.logger.info(f"Recycling browser after {self.pages} pages")
+            metrics.count("driver_recycles")
+            self.quit()
+
+    def quit(self):
+        if self._driver is None:
+            return
+        try:
+            self._driver.quit()
+        except Exception:
+            pass
+        self._driver = None
@@ -0,0 +1,69 @@
+import json
+import os
+import threading
+from pathlib import Path
+from logger import setup_logger
+
+
+class CountyIncomplete(Exception):
+    """Raised when some auction days of a county failed, so the county must not be marked complete"""
+
+
+class Checkpoint:
+    """Progress of the current run, saved after every auction day so an interrupted run can resume"""
+
+    def __init__(self, path="checkpoint.json", run_started=None):
+        self.logger = setup_logger()
+        self.path = path
+        self.run_started = run_started
+        self.completed_counties = set()
+        self.processed_days = {}  # {county: {iso_date, ...}}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path="checkpoint.json"):
+        """Checkpoint left by an interrupted run, or None if there isn't one"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        checkpoint = cls(path, data["run_started"])
+        checkpoint.completed_counties = set(data["completed_counties"])
+        checkpoint.processed_days = {county: set(days) for county, days in data["processed_days"].items()}
+        checkpoint.logger.info(f"Resuming run started {checkpoint.run_started}: "
+                               f"{len(checkpoint.completed_counties)} counties already complete")
+        return checkpoint
+
+    def save(self):
+        with self._lock:
+            data = {
+                "run_started": self.run_started,
+                "completed_counties": sorted(self.completed_counties),
+                "processed_days": {county: sorted(days) for county, days in self.processed_days.items()},
+            }
+            # Write then rename so a kill mid-write never leaves a truncated file
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+    def is_day_done(self, county, auction_date):
+        return auction_date.isoformat() in self.processed_days.get(county, ())
+
+    def mark_day_done(self, county, auction_date):
+        with self._lock:
+            self.processed_days.setdefault(county, set()).add(auction_date.isoformat())
+        self.save()
+
+    def is_county_done(self, county):
+        return county in self.completed_counties
+
+    def mark_county_done(self, county):
+        with self._lock:
+            self.completed_counties.add(county)
+        self.save()
+
+    def clear(self):
+        """Removes the file once the run has finished every county"""
+        Path(self.path).unlink(missing_ok=True)
@@ -0,0 +1,80 @@
+import numpy as np
+
+# Mortgage foreclosures open at 2/3 of the appraisal with one of a few fixed deposits;
+# every other upcoming listing is treated as a property tax sale
+DEFAULT_RULES = {
+    "bid_ratio": 2 / 3,
+    # (decimals the 2/3 value is rounded to, offset added) - all the variations present in data
+    "bid_variants": [(0, 0.0), (0, 1.0), (2, 0.0), (2, -0.1), (2, 0.1)],
+    "tolerance": 0.005,  # dollars; absorbs float noise in the parsed amounts
+    "deposits": [2000.0, 5000.0, 10000.0],
+}
+
+# Per-county overrides of DEFAULT_RULES, e.g. {"cuyahoga": {"deposits": [2000.0, 5000.0, 10000.0, 25000.0]}}
+COUNTY_RULES = {}
+
+NO_APPRAISAL = "no appraised value"
+BID_NOT_TWO_THIRDS = "opening bid is not 2/3 of appraisal"
+OTHER_DEPOSIT = "non-standard deposit"
+MORTGAGE = "2/3 opening bid with standard deposit"
+
+
+def _amounts(values):
+    """Float array from numbers or money strings; anything unreadable becomes NaN"""
+    amounts = np.full(len(values), np.nan)
+    for i, value in enumerate(values):
+        try:
+            amounts[i] = float(str(value).replace("$", "").replace(",", "").strip())
+        except ValueError:
+            pass
+    return amounts
+
+
+class Classifier:
+    """Evaluates the tax sale rule table over whole batches of listings at once"""
+
+    def __init__(self, rules=None, county_rules=None):
+        self.rules = {**DEFAULT_RULES, **(rules or {})}
+        self.county_rules = COUNTY_RULES if county_rules is None else county_rules
+
+    def rules_for(self, county):
+        return {**self.rules, **self.county_rules.get(county, {})}
+
+    def classify(self, appraised, opening_bid, deposit, counties=None):
+        """Returns (boolean array, True for a tax sale; reason for each listing)"""
+        appraised = _amounts(appraised)
+        opening_bid = _amounts(opening_bid)
+        deposit = _amounts(deposit)
+        counties = np.array(counties if counties is not None else [None] * len(appraised), dtype=object)
+
+        tax_sale = np.zeros(len(appraised), dtype=bool)
+        reasons = np.full(len(appraised), MORTGAGE, dtype=object)
+        # One vectorised pass per distinct rule set; most batches are a single county
+        for county in set(counties.tolist()):
+            rows = np.flatnonzero(counties == county)
+            rules = self.rules_for(county)
+            tolerance = rules["tolerance"]
+
+            expected = appraised[rows] * rules["bid_ratio"]
+            variants = np.stack([np.round(expected, decimals) + offset
+                                 for decimals, offset in rules["bid_variants"]], axis=1)
+            bid_ok = (np.abs(variants - opening_bid[rows, None]) <= tolerance).any(axis=1)
+            deposits = np.asarray(rules["deposits"], dtype=float)
+            deposit_ok = (np.abs(deposit[rows, None] - deposits[None, :]) <= tolerance).any(axis=1)
+            no_appraisal = appraised[rows] == 0
+
+            tax_sale[rows] = no_appraisal | ~bid_ok | ~deposit_ok
+            reasons[rows] = np.select([no_appraisal, ~bid_ok, ~deposit_ok],
+                                      [NO_APPRAISAL, BID_NOT_TWO_THIRDS, OTHER_DEPOSIT], default=MORTGAGE)
+        return tax_sale, reasons.tolist()
+
+    def classify_listings(self, listings):
+        """classify() over listing dicts (appraised_value, opening_bid, deposit, county)"""
+        return self.classify([listing["appraised_value"] for listing in listings],
+                             [listing["opening_bid"] for listing in listings],
+                             [listing["deposit"] for listing in listings],
+                             [listing.get("county") for listing in listings])
+
+
+# Shared by every engine; swap in a Classifier with other rules to try them out
+classifier = Classifier()
@@ -0,0 +1,174 @@
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from auction_parser import (
+    build_listings, decode_ret_html, parse_auction_items, parse_calendar_days,
+    parse_max_pages, parse_next_month_url
+)
+from logger import setup_logger
+from metrics import metrics
+from scheduler import parse_retry_after
+
+DAY_PATH = "index.cfm?zaction=AUCTION&Zmethod=PREVIEW&AuctionDate={date}"
+LOAD_PATH = "index.cfm?zaction=AUCTION&Zmethod=UPDATE&FNC=LOAD&AREA=W&PageDir={page_dir}&doR=1&tx={tx}&bypassPage=0"
+
+# Retried by get() rather than the adapter, so the throttle sees them and slows down
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36"
+
+
+class EngineFallback(Exception):
+    """Raised when a page cannot be scraped over plain HTTP and needs the browser"""
+
+
+class HttpEngine:
+    """Scrapes calendar and listing pages with pooled HTTP sessions instead of a browser"""
+
+    def __init__(self, throttle=None, pool_size=10, timeout=30, max_attempts=4):
+        self.logger = setup_logger()
+        self.throttle = throttle
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        # One connection pool shared by every session this engine hands out; the adapter only
+        # retries connection errors, status codes are left to get()
+        retry = Retry(total=3, backoff_factor=1, status_forcelist=[])
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self._local = threading.local()
+
+    def new_session(self):
+        """A session with its own cookies (the site keeps paging state there) on the shared pool"""
+        session = requests.Session()
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+        session.headers["User-Agent"] = USER_AGENT
+        return session
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self.new_session()
+        return session
+
+    def get(self, url, session=None, **kwargs):
+        """GET under the throttle; throttling and server errors are reported to it and retried with backoff"""
+        for attempt in range(1, self.max_attempts + 1):
+            if self.throttle is not None:
+                self.throttle.wait(url)
+            metrics.count("http_requests")
+            start = time.perf_counter()
+            try:
+                with metrics.timer("http.get"):
+                    response = (session or self._session()).get(url, timeout=self.timeout, **kwargs)
+            except requests.RequestException:
+                # Connection errors and timeouts are an overloaded host as far as the throttle is concerned
+                if self.throttle is not None:
+                    self.throttle.observe(url, time.perf_counter() - start, 503)
+                raise
+            if self.throttle is not None:
+                self.throttle.observe(url, time.perf_counter() - start, response.status_code)
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_attempts:
+                metrics.count("http_retries")
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if self.throttle is not None:
+                    self.throttle.backoff(url, attempt, retry_after=retry_after)
+                else:
+                    metrics.sleep(retry_after or 2 ** (attempt - 1), "backoff")
+                continue
+            response.raise_for_status()
+            return response
+
+    def day_url(self, website_link, auction_date):
+        return urljoin(website_link, DAY_PATH.format(date=auction_date.strftime("%m/%d/%Y")))
+
+    def fetch_calendar_month(self, url, session=None):
+        """Auction dates on one calendar page and the URL of the next month (or None)"""
+        page = self.get(url, session=session).text
+        return parse_calendar_days(page), parse_next_month_url(page, url)
+
+    def fetch_calendar(self, website_link, months=3):
+        """Auction dates for the current month and the following months"""
+        dates = []
+        url = website_link
+        for k in range(months):
+            month_dates, url = self.fetch_calendar_month(url)
+            dates.extend(month_dates)
+            if url is None:
+                break
+        return dates
+
+    def load_page(self, website_link, page_dir, session=None):
+        """Fetches one page of listings from the XHR endpoint behind the preview page"""
+        url = urljoin(website_link, LOAD_PATH.format(page_dir=page_dir, tx=int(time.time() * 1000)))
+        response = self.get(url, session=session, headers={"X-Requested-With": "XMLHttpRequest"})
+        try:
+            payload = response.json()
+        except ValueError:
+            raise EngineFallback(f"Listing response is not JSON: {url}")
+        if "retHTML" not in payload:
+            raise EngineFallback(f"Listing response has no retHTML: {url}")
+        return decode_ret_html(payload["retHTML"])
+
+    def fetch_first_page(self, website_link, auction_date, session):
+        """Opens an auction day in session and returns (max_pages, items on page 1)"""
+        preview = self.get(self.day_url(website_link, auction_date), session=session).text
+
+        items = parse_auction_items(preview)
+        page_html = preview
+        if not items:
+            # Items are usually filled in by script after the preview page loads
+            page_html = self.load_page(website_link, page_dir=0, session=session)
+            items = parse_auction_items(page_html)
+
+        max_pages = parse_max_pages(preview) or parse_max_pages(page_html)
+        if max_pages is None:
+            raise EngineFallback(f"No page count for {auction_date:%m/%d/%Y}")
+        return max_pages, items
+
+    def fetch_next_page(self, website_link, session):
+        """Items on the page after the one session is currently on"""
+        return parse_auction_items(self.load_page(website_link, page_dir=1, session=session))
+
+    def fetch_day_pages(self, website_link, auction_date):
+        """Yields (page_number, max_pages, items) for every page of an auction day"""
+        session = self.new_session()
+        max_pages, items = self.fetch_first_page(website_link, auction_date, session)
+        yield 1, max_pages, items
+
+        for page_number in range(2, max_pages + 1):
+            yield page_number, max_pages, self.fetch_next_page(website_link, session)
+
+    def scrape_county(self, website_link, county, on_listing, months=3, tracker=None, checkpoint=None):
+        """HTTP counterpart of scrapeData; raises EngineFallback when the browser is needed"""
+        today = datetime.today().date()
+        for auction_date in self.fetch_calendar(website_link, months):
+            if auction_date < today:
+                continue
+            if checkpoint is not None and checkpoint.is_day_done(county, auction_date):
+                continue  # Finished before the run was interrupted
+            day_url = self.day_url(website_link, auction_date)
+            print(auction_date.strftime("%B-%d-%Y"))
+            fingerprint = None
+            for page_number, max_pages, items in self.fetch_day_pages(website_link, auction_date):
+                metrics.count("pages")
+                metrics.count("items", len(items))
+                if page_number == 1:
+                    metrics.count("days")
+                    print("Total pages:", max_pages)
+                # Page 1 is passed on even when the rest of an unchanged day is skipped
+                for listing in build_listings(items, auction_date, county, day_url):
+                    on_listing(listing)
+                if page_number == 1 and tracker is not None:
+                    skip, fingerprint = tracker.check(county, auction_date, max_pages, items)
+                    if skip:
+                        break
+            else:
+                if fingerprint is not None:
+                    tracker.complete(county, auction_date, fingerprint)
+            if checkpoint is not None:
+                checkpoint.mark_day_done(county, auction_date)
@@ -1,266 +1,308 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from selenium.webdriver.support import expected_conditions as EC
 from time import sleep
 import time
 import math
+import argparse
+import queue
+import threading
 from datetime import datetime
 from sheets_manager import SheetsManager
+from auction_store import AuctionStore, DayTracker
+from checkpoint import Checkpoint, CountyIncomplete
+from metrics import metrics
+from scheduler import scheduler
+from auction_parser import build_listings, parse_auction_items, parse_calendar_days
+from browser import BrowserSession
+from classifier import classifier
+from sinks import JsonlSink, SheetSink
+from sharding import (
+    artifact_path, load_plan, merge_artifacts, parse_shard, shard_counties, write_artifact, write_plan,
+)
+from http_engine import HttpEngine, EngineFallback
+from async_pipeline import run_pipeline
 from logger import setup_logger
 logger = setup_logger()
 import logging
 import os
-os.environ['WDM_LOG_LEVEL'] = '1'  # 0=Silent, 1=Errors, 2=Warnings, 3=Info
-
-
-# Configure Chrome options (unchanged from your original)
-options = webdriver.ChromeOptions()
-# Headless configuration
-options.add_argument("--headless=new")  # Modern headless mode
-options.add_argument("--no-sandbox")  # Essential for CI/CD
-options.add_argument("--disable-dev-shm-usage")  # Prevents memory issues
-options.add_argument("--disable-gpu")  # Recommended for headless
-options.add_argument("--window-size=1920,1080")  # Virtual display size
-
-# Anti-detection settings
-options.add_argument("--disable-blink-features=AutomationControlled")
-options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36")
-options.add_experimental_option("excludeSwitches", ["enable-automation"])
-options.add_experimental_option('useAutomationExtension', False)
 
 
-# Initialize WebDriver with all warnings all logged
-driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
+http_engine = HttpEngine(throttle=scheduler)
 
-# Initialize SheetsManager (replace your old Sheets code with this)
+# Nothing is authenticated or read until the first sheet call, so importing this module stays cheap
 sheets = SheetsManager(
     json_keyfile="auction-list-scraper-466209-8e731da0fa26.json",
-    spreadsheet_name="Auction Listings"
+    spreadsheet_name="Auction Listings",
+    batch_mode=True
 )
-# 2. Remove expired auctions
-sheets.remove_expired_auctions()
 
-# 3. Before scraping, storing all the auctions to check later if any was cancelled or withdrawn
-existing_auctions = sheets.get_existing_auctions()  # {key: row_num}
-active_auctions = set()  # Just track active auction keys
+# Local source of truth; SheetSink brings the sheet in line with it at the end of the run
+store = None
+run_started = None
+day_tracker = None  # Set in incremental mode to skip auction days that haven't changed
+checkpoint = None
+sinks = []  # Outputs fed by write_listing and closed at the end of the run
 
-def scrapeData(website_link, county):
-    driver.get(website_link)
-    driver.implicitly_wait(30)
+def read_auction_item(auction):
+    """Reads one AUCTION_ITEM element into the same shape auction_parser produces"""
+    item = {"item_id": auction.get_attribute("aid") or auction.get_attribute("id") or "",
+            "status_label": "", "status_value": "", "cells": []}
 
-    # Getting data for the current month + next 2 months (to get at least 60 days advance)
-    for k in range(3):
-        # Get the count of auction dates first to avoid stale references
-        date_elements = driver.find_elements(By.CSS_SELECTOR, ".CALBOX[role='link'], .CALBOX.CALSELF")
-        num_auctions = len(date_elements)
-
-        # for each auction in the current month
-        for i in range(num_auctions):
-            try:
-                # Re-find elements each iteration to avoid staleness
-                current_dates = driver.find_elements(By.CSS_SELECTOR, ".CALBOX[role='link'], .CALBOX.CALSELF")
-                if i >= len(current_dates):  # Safety check
-                    break
+    # 1. Get the STATUS CONTAINER (always exists)
+    status_container = auction.find_element(By.CSS_SELECTOR, "div.AUCTION_STATS")
 
-                date_box = current_dates[i]
-                date = date_box.get_attribute("aria-label") or date_box.get_attribute("dayid")
-                this_date = (datetime.strptime(date, "%B-%d-%Y")).date()
-                if this_date < datetime.today().date():
-                    continue
-
-                # Click directly on the date box in each auction closure of the current month
-                date_box.click()
-                print(date)
-
-                try_again_count = 3
-                current_url = driver.current_url  # Save the initial URL
+    # 2. Get BOTH elements (label + dynamic value)
+    try:
+        # The label element (may say "Auction Status" or "Auction Sold")
+        item["status_label"] = status_container.find_element(By.CSS_SELECTOR, "div.ASTAT_MSGA").text
 
-                while try_again_count > 0:
-                    try:
-                        # Wait for max pages element
-                        max_pages = WebDriverWait(driver, 30).until(
-                            EC.visibility_of_element_located((By.ID, "maxWA"))
-                        ).text
-                        print("Total pages:", max_pages)
-
-                        max_pages = int(max_pages)
-                        for j in range(max_pages):
-                            # Find the auction container
-                            auction_container = driver.find_element(By.ID, "Area_W")
-
-                            # Loop over all auction items
-                            auction_elements = auction_container.find_elements(By.CSS_SELECTOR, "div.AUCTION_ITEM")
-                            num_auction_items = len(auction_elements)
-                            for x in range(num_auction_items):
-                                auction = auction_elements[x]
-                                # 1. Get the STATUS CONTAINER (always exists)
-                                status_container = auction.find_element(By.CSS_SELECTOR, "div.AUCTION_STATS")
-
-                                # 2. Get BOTH elements (label + dynamic value)
-                                try:
-                                    # The label element (may say "Auction Status" or "Auction Sold")
-                                    status_label = status_container.find_element(By.CSS_SELECTOR, "div.ASTAT_MSGA").text
-
-                                    # The dynamic value element (contains actual status like "07/07/2025 09:01 AM ET")
-                                    status_value = status_container.find_element(By.CSS_SELECTOR, "div.ASTAT_MSGB").text
-
-                                    print(f"Raw Label: {status_label} | Status Value: {status_value}")
-
-                                    status_text = ""
-                                    # 3. Determine true status
-                                    if "Sold" in status_label:
-                                        status_text = "Auction Sold"
-                                    else:
-                                        if "Starts" in status_value:
-                                            status_text = "Auction Starts"
-                                        elif "Cancelled" in status_value:
-                                            status_text = "Status Cancelled"
-
-                                except NoSuchElementException:
-                                    print("Could not parse auction status")
-
-                                if status_label == "Auction Starts":
-                                    # Find the table and get all rows
-                                    table = auction.find_element(By.CSS_SELECTOR, "table.ad_tab")
-                                    rows = table.find_elements(By.TAG_NAME, "tr")
-
-                                    # Get last 3 rows (Appraised Value, Opening Bid, Deposit Requirement)
-                                    last_three_rows = rows[-3:] if len(rows) >= 3 else rows
-
-                                    # Extract the data from each row's td.AD_DTA
-                                    appraised_value = last_three_rows[0].find_element(By.CSS_SELECTOR,
-                                                                                      "td.AD_DTA").text.strip()
-                                    opening_bid = last_three_rows[1].find_element(By.CSS_SELECTOR,
-                                                                                  "td.AD_DTA").text.strip()
-                                    deposit_requirement = last_three_rows[2].find_element(By.CSS_SELECTOR,
-                                                                                          "td.AD_DTA").text.strip()
-
-                                    address_line0 = rows[3].find_element(By.CSS_SELECTOR,
-                                                                          "td.AD_DTA").text.strip()  # 5th last row (often city/state/zip)
-                                    address_line1 = rows[-4].find_element(By.CSS_SELECTOR,
-                                                                          "td.AD_DTA").text.strip()  # 4th last row
-                                    # Combine address lines
-                                    full_address = f"{address_line0} {address_line1}".strip()
-
-                                    # Clean and convert values
-                                    clean_value = float(appraised_value.replace("$", "").replace(",", ""))
-                                    opening_bid_float = float(opening_bid.replace("$", "").replace(",", ""))
-
-                                    deposit_clean = deposit_requirement.replace("$", "").replace(",", "")
-
-                                    # Calculate expected 2/3 value (all the different variations present in data)
-                                    check_value_1 = round(2 / 3 * clean_value, 0)
-                                    check_value_2 = round(2 / 3 * clean_value, 2)
-                                    check_value_3 = check_value_1 + 1.0
-                                    check_value_4 = check_value_2 - 0.1
-                                    check_value_5 = check_value_2 + 0.1
-
-                                    # Filter conditions
-                                    is_property_tax_sale = (
-                                            clean_value == 0 or
-                                            (opening_bid_float != check_value_1 and opening_bid_float != check_value_2 and opening_bid_float != check_value_3 and opening_bid_float != check_value_4 and opening_bid_float != check_value_5) or
-                                            deposit_clean not in ["2000.00", "5000.00", "10000.00"]
-                                    )
-
-                                    if is_property_tax_sale:
-                                        # Format date exactly as MM-DD-YYYY
-                                        formatted_date = this_date.strftime("%m-%d-%Y")
-
-                                        # Generate proper link (using case number if available)
-                                        try:
-                                            case_num = rows[1].find_element(By.CSS_SELECTOR, "td.AD_DTA").text.strip()
-                                            link = f"{website_link}&case={case_num}"
-                                        except Exception:
-                                            link = website_link  # Fallback to base URL
-
-                                        # Add to Google Sheets (with duplicate protection)
-                                        added = sheets.add_auction(
-                                            date=formatted_date,
-                                            county=county,
-                                            address=full_address,
-                                            link=current_url
-                                        )
-
-                                        if added:
-                                            print(
-                                                f"✓ Added to Sheets: {formatted_date} | {county} | {full_address[:50]}...")
-                                        else:
-                                            print(f"⏩ Duplicate skipped: {full_address[:50]}...")
-
-                                        # When finding active auctions, set true in the set:
-                                        unique_key = sheets._create_auction_key({
-                                            "Auction Date": formatted_date,
-                                            "County": county,
-                                            "Address": full_address
-                                        })
-                                        active_auctions.add(unique_key)  # Works for both new and existing auctions
-
-                                        time.sleep(2) # sleep a second to not exceed sheets writing quota per user
-
-                            try:
-                                next_page = driver.find_element(By.CSS_SELECTOR, "span.PageRight > img")
-                                next_page.click()
-                                time.sleep(2)
-                            except NoSuchElementException:
-                                break  # End of pagination
-
-                        break  # Success - exit retry loop
-
-                    except TimeoutException:
-                        try_again_count -= 1
-                        print(f"Loading failed. Retries remaining: {try_again_count}")
-
-                        if try_again_count > 0:
-                            try:
-                                x -= 1
-                            except NameError:
-                                i -= 1
-                            driver.get(current_url)
-                        else:
-                            if 'x' not in locals() and 'i' in locals():
-                                logger.error(f"Auction failed | County: {county} | Date: {date} | Error: The website elements failed to load in time",exc_info=True)
-                    except Exception as e:
-                        print(f"Unexpected error: {str(e)}")
-                        try_again_count -= 1
-                        if try_again_count > 0:
-                            try:
-                                x -= 1
-                            except NameError:
-                                i -= 1
-                            driver.get(current_url)
-                            time.sleep(3)
-                        else:
-                            if 'x' not in locals() and 'i' in locals():
-                                logger.error(f"Auction failed | County: {county} | Date: {date} | Error: The website elements failed to load in time", exc_info = True)
-                # Go back and wait for calendar to reload
-                driver.back()
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".CALDAYBOX")))
-                print("\n")
+        # The dynamic value element (contains actual status like "07/07/2025 09:01 AM ET")
+        item["status_value"] = status_container.find_element(By.CSS_SELECTOR, "div.ASTAT_MSGB").text
 
-            except Exception as e:
-                print(f"Couldn't parse auction {i + 1}/{num_auctions}: {str(e)}")
-                if "stale" in str(e).lower():
-                    driver.refresh()
-                    WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, ".CALDAYBOX")))
-                else:
-                    driver.back()
+        print(f"Raw Label: {item['status_label']} | Status Value: {item['status_value']}")
+    except NoSuchElementException:
+        print("Could not parse auction status")
 
+    # Only upcoming auctions are filtered further, so skip reading the table for the rest
+    if item["status_label"] == "Auction Starts":
+        table = auction.find_element(By.CSS_SELECTOR, "table.ad_tab")
+        for row in table.find_elements(By.TAG_NAME, "tr"):
+            try:
+                item["cells"].append(row.find_element(By.CSS_SELECTOR, "td.AD_DTA").text.strip())
+            except NoSuchElementException:
+                item["cells"].append(None)
+    return item
+
+
+# Reads every AUCTION_ITEM on the page in one WebDriver call, same shape as auction_parser.parse_auction_items
+EXTRACT_ITEMS_JS = """
+function clean(element) {
+    return element ? element.innerText.replace(/\\s+/g, ' ').trim() : '';
+}
+return Array.from(document.querySelectorAll('#Area_W div.AUCTION_ITEM')).map(function (auction) {
+    var stats = auction.querySelector('div.AUCTION_STATS');
+    var table = auction.querySelector('table.ad_tab');
+    var rows = table ? Array.from(table.querySelectorAll('tr')) : [];
+    return {
+        item_id: auction.getAttribute('aid') || auction.id || '',
+        status_label: clean(stats && stats.querySelector('div.ASTAT_MSGA')),
+        status_value: clean(stats && stats.querySelector('div.ASTAT_MSGB')),
+        cells: rows.map(function (row) {
+            var cell = row.querySelector('td.AD_DTA');
+            return cell ? clean(cell) : null;
+        })
+    };
+});
+"""
+
+# script: one execute_script call per page, source: parse page_source with lxml,
+# elements: one WebDriver call per element (slowest, kept as a fallback)
+extraction_mode = "script"
+recycle_pages = 200  # Restart a worker's Chrome after this many listing pages
+block_resources = True
+
+
+def extract_auction_items(driver):
+    """All auction items on the current listing page"""
+    if extraction_mode == "script":
+        return driver.execute_script(EXTRACT_ITEMS_JS)
+    if extraction_mode == "source":
+        return parse_auction_items(driver.page_source)
+
+    # Find the auction container
+    auction_container = driver.find_element(By.ID, "Area_W")
+
+    # Loop over all auction items
+    auction_elements = auction_container.find_elements(By.CSS_SELECTOR, "div.AUCTION_ITEM")
+    return [read_auction_item(auction) for auction in auction_elements]
+
+
+# Changes whenever a new page of listings has been rendered
+PAGE_SIGNATURE_JS = """
+var page = document.getElementById('curPWA');
+var first = document.querySelector('#Area_W div.AUCTION_ITEM');
+return [page ? (page.value || page.textContent) : '', first ? (first.getAttribute('aid') || first.id) : ''];
+"""
+
+
+def load_page(driver, url):
+    """driver.get under the host's rate limit, reporting the load time back to the scheduler"""
+    scheduler.wait(url)
+    start = time.perf_counter()
+    with metrics.timer("driver.get"):
+        driver.get(url)
+    scheduler.observe(url, time.perf_counter() - start)
+
+
+def wait_for_calendar(driver, timeout=20):
+    """Waits for the calendar grid; raises TimeoutException if it never renders"""
+    WebDriverWait(driver, timeout).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, ".CALDAYBOX")),
+        message=f"Calendar did not render within {timeout}s: {driver.current_url}")
+
+
+def wait_for_items(driver, timeout=10):
+    """Waits for the first listing of a day that has pages; raises TimeoutException if none renders"""
+    with metrics.timer("wait.items"):
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "#Area_W div.AUCTION_ITEM")),
+            message=f"No auction items rendered within {timeout}s: {driver.current_url}")
+
+
+def click(driver, element):
+    """Clicks through script; with images and CSS blocked, arrow icons have no size to click on"""
+    driver.execute_script("arguments[0].click();", element)
+
+
+def turn_page(driver, next_page, website_link, timeout=30):
+    """Clicks PageRight and waits until the page number or the first listing changes"""
+    before = driver.execute_script(PAGE_SIGNATURE_JS)
+    scheduler.wait(website_link)
+    start = time.perf_counter()
+    with metrics.timer("pagination.click"):
+        click(driver, next_page)
+        WebDriverWait(driver, timeout).until(lambda d: d.execute_script(PAGE_SIGNATURE_JS) != before)
+    scheduler.observe(website_link, time.perf_counter() - start)
+
+
+def calendar_dates(driver, website_link, months=3, attempts=3):
+    """Auction dates on the county calendar, retried; raises if the calendar never renders"""
+    for attempt in range(1, attempts + 1):
+        try:
+            return read_calendar(driver, website_link, months)
+        except TimeoutException:
+            metrics.count("retries")
+            print(f"Calendar failed to load. Retries remaining: {attempts - attempt}")
+            scheduler.observe(website_link, latency=20)
+            if attempt == attempts:
+                raise
+            scheduler.backoff(website_link, attempt)
+
+
+def read_calendar(driver, website_link, months=3):
+    """Auction dates on the county calendar for the current month and the following ones"""
+    load_page(driver, website_link)
+    # Every wait below is explicit; an implicit wait would stall each missing element for the full timeout
+    driver.implicitly_wait(0)
+    wait_for_calendar(driver)
+
+    dates = []
+    # Getting data for the current month + next 2 months (to get at least 60 days advance)
+    for k in range(months):
+        with metrics.timer("calendar.read"):
+            dates.extend(parse_calendar_days(driver.page_source))
+        if k == months - 1:
+            break
         try:
             next_month = WebDriverWait(driver, 20).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "div.CALNAV a[aria-label^='Next Month']"))
+                EC.presence_of_element_located((By.CSS_SELECTOR, "div.CALNAV a[aria-label^='Next Month']"))
             )
-            next_month.click()
-
         except (TimeoutException, NoSuchElementException):
             print("No more months available")
             break  # Exit if no next month button
 
+        old_calendar = driver.find_elements(By.CSS_SELECTOR, ".CALDAYBOX")
+        scheduler.wait(website_link)
+        click(driver, next_month)
+        # Ready once the previous month's calendar has been replaced; a timeout here is a failed load
+        WebDriverWait(driver, 20).until(EC.staleness_of(old_calendar[0]))
+        wait_for_calendar(driver)
+    return dates
+
+
+def scrapeData(browser, website_link, county, on_listing, tracker=None, checkpoint=None):
+    """Walks a county calendar and passes every listing found, classified where upcoming, to on_listing"""
+    today = datetime.today().date()
+    failed_days = []
+    for this_date in calendar_dates(browser.driver, website_link):
+        if this_date < today:
+            continue
+        if checkpoint is not None and checkpoint.is_day_done(county, this_date):
+            continue  # Finished before the run was interrupted
+
+        # Between days is the only safe point to restart Chrome: paging state lives in the session
+        browser.recycle_if_due()
+        driver = browser.driver
+        driver.implicitly_wait(0)
+        date = this_date.strftime("%B-%d-%Y")
+        day_url = http_engine.day_url(website_link, this_date)
+        metrics.count("days")
+        print(date)
+
+        try_again_count = 3
+        while try_again_count > 0:
+            try:
+                # Open the day straight from its URL, so the calendar never has to be rendered again
+                load_page(driver, day_url)
+                # Wait for max pages element
+                with metrics.timer("wait.maxWA"):
+                    max_pages = WebDriverWait(driver, 30).until(
+                        EC.presence_of_element_located((By.ID, "maxWA"))
+                    ).get_attribute("textContent").strip()
+                print("Total pages:", max_pages)
+
+                max_pages = int(max_pages)
+                if max_pages > 0:
+                    wait_for_items(driver)
+                fingerprint = None
+                day_skipped = False
+                for j in range(max_pages):
+                    with metrics.timer("extract.page"):
+                        items = extract_auction_items(driver)
+                    browser.count_page()
+                    metrics.count("pages")
+                    metrics.count("items", len(items))
+
+                    # Page 1 is passed on even when the rest of an unchanged day is skipped
+                    for listing in build_listings(items, this_date, county, day_url):
+                        on_listing(listing)
+
+                    # Incremental mode: stop after the first page if the day hasn't changed
+                    if j == 0 and tracker is not None:
+                        day_skipped, fingerprint = tracker.check(county, this_date, max_pages, items)
+                        if day_skipped:
+                            break
+
+                    if j == max_pages - 1:
+                        break  # Last page, nothing to click
+                    try:
+                        next_page = driver.find_element(By.CSS_SELECTOR, "span.PageRight > img")
+                    except NoSuchElementException:
+                        break  # End of pagination
+                    turn_page(driver, next_page, website_link)
+
+                if fingerprint is not None and not day_skipped:
+                    tracker.complete(county, this_date, fingerprint)
+                if checkpoint is not None:
+                    checkpoint.mark_day_done(county, this_date)
+                break  # Success - exit retry loop
+
+            except TimeoutException:
+                try_again_count -= 1
+                metrics.count("retries")
+                print(f"Loading failed. Retries remaining: {try_again_count}")
+                # A page that never became ready counts as a slow response for this host
+                scheduler.observe(day_url, latency=30)
+                if try_again_count == 0:
+                    logger.error(f"Auction failed | County: {county} | Date: {date} | Error: The website elements failed to load in time", exc_info=True)
+                    failed_days.append(date)
+            except Exception as e:
+                print(f"Unexpected error: {str(e)}")
+                try_again_count -= 1
+                metrics.count("retries")
+                if try_again_count > 0:
+                    scheduler.backoff(day_url, attempt=3 - try_again_count)
+                else:
+                    logger.error(f"Auction failed | County: {county} | Date: {date} | Error: {str(e)}", exc_info=True)
+                    failed_days.append(date)
+        print("\n")
+
+    # The other days are written; leave the county incomplete so it is neither swept nor skipped on --resume
+    if failed_days:
+        raise CountyIncomplete(f"{len(failed_days)} auction days failed: {', '.join(failed_days)}")
+
 
 
 counties = [
@@ -279,33 +321,279 @@ counties = [
     "wayne", "williams", "wood", "wyandot"
 ]
 
-if __name__ == "__main__":
-    try:
-        for county in counties:
-            website_link = f"https://{county}.sheriffsaleauction.ohio.gov/index.cfm?zaction=USER&zmethod=CALENDAR"
-            logger.info(f"Starting scrape for {county.upper()} county")
+def county_url(county):
+    return f"https://{county}.sheriffsaleauction.ohio.gov/index.cfm?zaction=USER&zmethod=CALENDAR"
+
+
+def scrape_worker(worker_id, county_queue, engine="selenium"):
+    """Pulls counties off the shared queue until it is empty, each on this worker's own Chrome"""
+    browser = BrowserSession(recycle_pages=recycle_pages, block_resources=block_resources)
+    while True:
+        try:
+            county = county_queue.get_nowait()
+        except queue.Empty:
+            break
+
+        website_link = county_url(county)
+        with metrics.for_county(county), metrics.timer("county"):
             try:
-                scrapeData(website_link, county)
+                logger.info(f"[worker {worker_id}] Starting scrape for {county.upper()} county")
+                scraped = False
+                if engine == "http":
+                    try:
+                        http_engine.scrape_county(website_link, county, write_listing, tracker=day_tracker, checkpoint=checkpoint)
+                        scraped = True
+                    except EngineFallback as e:
+                        # Only start a browser for counties the HTTP engine can't handle
+                        logger.info(f"{county}: falling back to Selenium ({str(e)})")
+                if not scraped:
+                    scrapeData(browser, website_link, county, write_listing, tracker=day_tracker, checkpoint=checkpoint)
+                checkpoint.mark_county_done(county)
+            except CountyIncomplete as e:
+                logger.error(f"COUNTY INCOMPLETE: {county} | URL: {website_link} | {str(e)}")
+                metrics.count("county_failures")
+            except WebDriverException as e:
+                # The browser itself is unusable; start a fresh one for the next county
+                logger.error(f"COUNTY-WIDE FAILURE: {county} | URL: {website_link} | Error: {str(e)}", exc_info=True)
+                metrics.count("county_failures")
+                browser.quit()
             except Exception as e:
                 logger.error(f"COUNTY-WIDE FAILURE: {county} | URL: {website_link} | Error: {str(e)}", exc_info=True)
-                continue
+                metrics.count("county_failures")
             finally:
-                time.sleep(2)
+                county_queue.task_done()
+
+    browser.quit()
+
+
+def scrape_counties(county_list, workers, engine="selenium"):
+    """Scrapes every county with a pool of browser workers; listings go straight to the store"""
+    county_queue = queue.Queue()
+    for county in county_list:
+        county_queue.put(county)
+
+    threads = [
+        threading.Thread(target=scrape_worker, args=(n + 1, county_queue, engine), daemon=True)
+        for n in range(min(workers, len(county_list)))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def write_listing(listing):
+    """Hands one listing to every sink; classified sales also go to the local store, non-tax sales as excluded"""
+    for sink in sinks:
+        sink.write(listing)
+    if listing["tax_sale"] is None:
+        return  # Exported only: not upcoming or incomplete, so never classified
+
+    with metrics.timer("store.upsert", listing["county"]):
+        is_new = store.upsert(listing, run_started)
+    if not listing["tax_sale"]:
+        metrics.count("excluded", county=listing["county"])
+        return  # Stored so --reclassify can bring it back under other rules
+    metrics.count("listings", county=listing["county"])
+    if is_new:
+        print(f"✓ New auction: {listing['date']} | {listing['county']} | {listing['address'][:50]}...")
+    else:
+        print(f"⏩ Already known: {listing['address'][:50]}...")
+
+
+def shard_arg(text):
+    try:
+        return parse_shard(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def positive_float(text):
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a number: {text!r}")
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {text}")
+    return value
+
+
+def county_seconds():
+    """Seconds each county took in this run, from the metrics"""
+    return {county: stages["county"] for county, stages in metrics.county_timings.items() if "county" in stages}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape Ohio sheriff sale auctions into Google Sheets")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("SCRAPER_WORKERS", 1)),
+                        help="Number of parallel Chrome workers (default: 1)")
+    parser.add_argument("--host-delay", type=positive_float, default=os.environ.get("SCRAPER_HOST_DELAY", "1.0"),
+                        help="Starting gap in seconds between requests to the same county site. It is a starting "
+                             "point, not a floor: the scheduler adapts it to each site's latency and errors, from "
+                             "a quarter of it for fast healthy sites up to ten times it (default: 1.0)")
+    parser.add_argument("--engine", choices=["selenium", "http", "async"], default=os.environ.get("SCRAPER_ENGINE", "selenium"),
+                        help="Fetch listing pages with a browser, with direct HTTP requests, or with the asyncio "
+                             "HTTP pipeline that writes listings while it crawls (default: selenium)")
+    parser.add_argument("--extract", choices=["script", "source", "elements"], default="script",
+                        help="Selenium engine: read each listing page with one script call, by parsing the page "
+                             "source, or element by element (default: script)")
+    parser.add_argument("--recycle-pages", type=int, default=200,
+                        help="Selenium engine: restart a worker's Chrome after this many listing pages, 0 to never "
+                             "restart (default: 200)")
+    parser.add_argument("--load-resources", action="store_true",
+                        help="Selenium engine: let Chrome load images, fonts and stylesheets")
+    parser.add_argument("--reclassify", action="store_true",
+                        help="Re-apply the tax sale rules to the auctions already in the database and sync the "
+                             "sheet, without scraping")
+    parser.add_argument("--export", metavar="DIR", default=os.environ.get("SCRAPER_EXPORT"),
+                        help="Stream every parsed auction item (upcoming, sold, cancelled) to "
+                             "DIR/<run date>/listings.jsonl and compact it at the end of the run")
+    parser.add_argument("--export-format", choices=["csv", "parquet"], default="csv",
+                        help="Compacted export format; parquet needs pyarrow (default: csv)")
+    parser.add_argument("--no-sheet", action="store_true",
+                        help="Don't sync the Google Sheet; the store and exports are still written")
+    parser.add_argument("--shard", type=shard_arg, metavar="I/N",
+                        help="Scrape only shard I of N (counties split by past runtime) and write its results to "
+                             "--shard-dir for a later --merge instead of sweeping and syncing the sheet")
+    parser.add_argument("--shard-dir", default="shards", help="Where --shard writes its artifact (default: shards)")
+    parser.add_argument("--plan-shards", type=int, metavar="N",
+                        help="Split the counties into N shards by past runtime, write the split to --shard-plan "
+                             "and exit, without scraping")
+    parser.add_argument("--shard-plan", metavar="PATH",
+                        help="Split written by --plan-shards; --shard then takes its counties from it, so every "
+                             "shard of a run agrees whatever database it has")
+    parser.add_argument("--merge", nargs="+", metavar="ARTIFACT",
+                        help="Apply shard artifacts to the database, sweep cancelled auctions in the counties they "
+                             "completed and sync the sheet, without scraping")
+    parser.add_argument("--db", default=os.environ.get("SCRAPER_DB", "auctions.db"),
+                        help="SQLite file holding every auction seen across runs (default: auctions.db)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Skip the pagination walk of auction days whose first page matches the last run; "
+                             "only the first page of a skipped day reaches --export")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run from its checkpoint, skipping finished counties and days")
+    parser.add_argument("--checkpoint", default="checkpoint.json",
+                        help="Checkpoint file written while the run progresses (default: checkpoint.json)")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Async engine: maximum requests in flight across all counties (default: 16)")
+    parser.add_argument("--per-host", type=int, default=2,
+                        help="Async engine: maximum requests in flight per county site (default: 2)")
+    args = parser.parse_args()
+    if args.plan_shards and not args.shard_plan:
+        parser.error("--plan-shards needs --shard-plan PATH to write the split to")
+    return args
+
+
+def main():
+    """Runs the scraper; Chrome and Google Sheets are only started once something needs them"""
+    global store, run_started, day_tracker, checkpoint
+    global extraction_mode, recycle_pages, block_resources, sinks
+    args = parse_args()
+    scheduler.host_rate = 1 / args.host_delay
+    extraction_mode = args.extract
+    recycle_pages = args.recycle_pages
+    block_resources = not args.load_resources
+    store = AuctionStore(args.db)
+
+    # A new (or lost) store starts from the sheet's rows, so a county that fails this run keeps them.
+    # Shards and the planning step skip this: the merge step seeds its own store before syncing
+    if store.needs_seed() and not args.no_sheet and not args.shard and not args.plan_shards:
+        try:
+            store.seed_from_sheet(sheets.get_auction_records())
+        except Exception as e:
+            logger.error(f"Could not seed the store from the sheet, will retry before the sync: {str(e)}", exc_info=True)
+
+    if args.reclassify:
+        store.reclassify(classifier)
+        if not args.no_sheet:
+            SheetSink(store, sheets).close()
+        store.close()
+        exit(0)
+
+    if args.merge:
+        # One sweep and one sheet sync for every shard of the run
+        merged_at = datetime.now().isoformat(timespec="seconds")
+        completed = merge_artifacts(store, args.merge, merged_at)
+        store.finish_run(merged_at, counties=completed)
+        if not args.no_sheet:
+            SheetSink(store, sheets).close()
+        store.close()
+        exit(0)
+
+    if args.plan_shards:
+        write_plan(args.shard_plan, counties, args.plan_shards, store.county_runtimes())
+        store.close()
+        exit(0)
+
+    county_list = counties
+    if args.shard and args.shard_plan:
+        county_list = load_plan(args.shard_plan, *args.shard)
+        logger.info(f"Shard {args.shard[0]}/{args.shard[1]} from {args.shard_plan}: {', '.join(county_list)}")
+    elif args.shard:
+        county_list = shard_counties(counties, *args.shard, runtimes=store.county_runtimes())
+        logger.info(f"Shard {args.shard[0]}/{args.shard[1]}: {', '.join(county_list)}")
+
+    checkpoint = Checkpoint.load(args.checkpoint) if args.resume else None
+    if checkpoint is None:
+        checkpoint = Checkpoint(args.checkpoint, datetime.now().isoformat(timespec="seconds"))
+    # A resumed run keeps its original start time so auctions seen before the interruption still count
+    run_started = checkpoint.run_started
+    checkpoint.save()
+
+    # The export directory is named after the run date, so a resumed run appends to the same file
+    if args.export:
+        sinks.append(JsonlSink(args.export, run_date=run_started[:10], compact_format=args.export_format))
+    if not args.no_sheet and not args.shard:
+        sinks.append(SheetSink(store, sheets))
+
+    if args.incremental:
+        day_tracker = DayTracker(store, run_started)
+    try:
+        remaining = [county for county in county_list if not checkpoint.is_county_done(county)]
+        if args.engine == "async":
+            # Listings are written by the pipeline's consumer while the crawl is still running
+            fallback = run_pipeline(http_engine, {county: county_url(county) for county in remaining}, write_listing,
+                                    max_concurrency=args.concurrency, per_host=args.per_host, tracker=day_tracker,
+                                    checkpoint=checkpoint)
+            scrape_counties(fallback, max(1, args.workers))
+        else:
+            scrape_counties(remaining, max(1, args.workers), args.engine)
         #logger.info(f"Scraping completed: {new_rows_count} new rows added, {updated_rows_count} rows updated")
 
-        # Find auctions to remove (exist in sheet but not in active_auctions)
-        rows_to_delete = [
-            row_num for key, row_num in existing_auctions.items()
-            if key not in active_auctions
-        ]
-        # Delete from bottom to avoid index shifting
-        for row_num in sorted(rows_to_delete, reverse=True):
-            sheets.sheet.delete_rows(row_num)
-            time.sleep(1)
-
-        driver.quit()
+        # Auctions the store had as active but this run didn't see were cancelled or withdrawn.
+        # Only counties that finished are swept, a failed county must not lose its auctions
+        unfinished = [county for county in county_list if not checkpoint.is_county_done(county)]
+        if unfinished:
+            logger.warning(f"{len(unfinished)} counties not complete, not sweeping them "
+                           f"(rerun with --resume): {', '.join(unfinished)}")
+        if args.shard:
+            # The merge step sweeps and syncs once all shards are in
+            write_artifact(artifact_path(args.shard_dir, *args.shard), store, f"{args.shard[0]}/{args.shard[1]}",
+                           run_started, county_list, checkpoint.completed_counties, county_seconds())
+        else:
+            store.finish_run(run_started, counties=checkpoint.completed_counties)
+            store.save_runtimes({county: seconds for county, seconds in county_seconds().items()
+                                 if checkpoint.is_county_done(county)}, run_started)
+
+        # Compact the exports and push only the difference to the sheet; if one sink fails
+        # the others still run and the store still has this run
+        for sink in sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.error(f"{type(sink).__name__} failed, will catch up next run: {str(e)}", exc_info=True)
+
+        store.close()
+        if not unfinished:
+            checkpoint.clear()
         exit(0)
     except Exception as e:
         logger.critical(f"Fatal error in main execution: {str(e)}", exc_info=True)
-        driver.quit()
         exit(1)
+    finally:
+        # Uploaded with the logs artifact; compare runs to spot bottlenecks and regressions
+        logger.info(f"Run metrics written to {metrics.write_report('logs')}")
+
+
+if __name__ == "__main__":
+    main()
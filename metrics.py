@@ -0,0 +1,125 @@
+import contextvars
+import csv
+import json
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(values))
+    return values[max(0, min(len(values), rank) - 1)]
+
+
+class Metrics:
+    """Collects stage timings and per-county counters for the run report"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # A context variable follows asyncio tasks and asyncio.to_thread, unlike a thread-local
+        self._county_var = contextvars.ContextVar("metrics_county", default=None)
+        self.reset()
+
+    def reset(self):
+        """Drops everything recorded so far, e.g. between benchmark scenarios"""
+        self.started = time.monotonic()
+        self.timings = defaultdict(list)  # {stage: [seconds, ...]}
+        self.county_timings = defaultdict(lambda: defaultdict(float))  # {county: {stage: seconds}}
+        self.counters = defaultdict(Counter)  # {county or "_run": {name: count}}
+
+    def _county(self, county):
+        return county or self._county_var.get()
+
+    @contextmanager
+    def for_county(self, county):
+        """Attributes everything recorded in this thread or task to county"""
+        token = self._county_var.set(county)
+        try:
+            yield
+        finally:
+            self._county_var.reset(token)
+
+    def record(self, stage, seconds, county=None):
+        county = self._county(county)
+        with self._lock:
+            self.timings[stage].append(seconds)
+            if county:
+                self.county_timings[county][stage] += seconds
+
+    @contextmanager
+    def timer(self, stage, county=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, county)
+
+    def count(self, name, n=1, county=None):
+        county = self._county(county) or "_run"
+        with self._lock:
+            self.counters[county][name] += n
+
+    def sleep(self, seconds, reason="sleep", county=None):
+        """time.sleep that shows up in the report"""
+        with self.timer(f"sleep.{reason}", county):
+            time.sleep(seconds)
+
+    def report(self):
+        with self._lock:
+            stages = {}
+            for stage, values in sorted(self.timings.items()):
+                values = sorted(values)
+                stages[stage] = {
+                    "count": len(values),
+                    "total_s": round(sum(values), 3),
+                    "mean_s": round(sum(values) / len(values), 4),
+                    "p50_s": round(percentile(values, 50), 4),
+                    "p95_s": round(percentile(values, 95), 4),
+                    "max_s": round(values[-1], 4),
+                }
+            counties = {
+                county: {
+                    "counters": dict(self.counters.get(county, {})),
+                    "seconds": {stage: round(total, 3) for stage, total in sorted(self.county_timings.get(county, {}).items())},
+                }
+                for county in sorted(set(self.counters) | set(self.county_timings))
+            }
+        return {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "wall_clock_s": round(time.monotonic() - self.started, 3),
+            "stages": stages,
+            "counties": counties,
+        }
+
+    def write_report(self, directory="logs"):
+        """Writes metrics-<timestamp>.json and a flat .csv next to it; returns the JSON path"""
+        report = self.report()
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        stem = Path(directory) / f"metrics-{datetime.now():%Y%m%d-%H%M%S}"
+
+        with open(f"{stem}.json", "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        with open(f"{stem}.csv", "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["scope", "name", "metric", "value"])
+            for stage, stats in report["stages"].items():
+                for metric, value in stats.items():
+                    writer.writerow(["stage", stage, metric, value])
+            for county, data in report["counties"].items():
+                for name, value in data["counters"].items():
+                    writer.writerow([county, name, "count", value])
+                for stage, value in data["seconds"].items():
+                    writer.writerow([county, stage, "total_s", value])
+        return f"{stem}.json"
+
+
+# One collector for the whole process
+metrics = Metrics()
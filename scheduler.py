@@ -0,0 +1,123 @@
+import math
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from metrics import metrics
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (seconds or an HTTP date), or None if it can't be read"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)  # HTTP dates are always GMT
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Token bucket whose refill rate adapts to what the target reports back.
+
+    Throttling (429) and server errors halve the rate, slow responses trim it, and
+    every healthy response nudges it back up towards max_rate.
+    """
+
+    def __init__(self, rate, capacity=1, min_rate=None, max_rate=None, target_latency=3.0):
+        self.rate = rate  # tokens per second
+        self.capacity = capacity
+        self.min_rate = min_rate or rate / 10
+        self.max_rate = max_rate or rate * 4
+        self.target_latency = target_latency
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Blocks until a request may be sent; returns the seconds waited"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Take the token now (possibly going negative) so concurrent callers queue up behind us
+            self.tokens -= 1
+            wait = max(0.0, -self.tokens / self.rate, self.blocked_until - now)
+        if wait > 0:
+            metrics.sleep(wait, "throttle")
+        return wait
+
+    def observe(self, latency, status=200):
+        with self._lock:
+            if status == 429 or status >= 500:
+                self.rate = max(self.min_rate, self.rate / 2)
+            elif latency > self.target_latency:
+                self.rate = max(self.min_rate, self.rate * 0.8)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 50)
+
+    def pause(self, seconds):
+        """Stops handing out tokens for a while, e.g. after a Retry-After header"""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class RateScheduler:
+    """Per-target rate limits: one bucket per county host, plus named targets such as "sheets" """
+
+    def __init__(self, host_rate=1.0):
+        self.host_rate = host_rate
+        self._buckets = {}
+        self._targets = {}
+        self._lock = threading.Lock()
+
+    def configure(self, target, rate, capacity=1, **kwargs):
+        """Sets the limits for a named target (or host) before it is first used"""
+        with self._lock:
+            self._targets[target] = dict(rate=rate, capacity=capacity, **kwargs)
+            self._buckets.pop(target, None)
+
+    def _key(self, target):
+        return urlparse(target).netloc or target
+
+    def bucket(self, target):
+        key = self._key(target)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(**self._targets.get(key, {"rate": self.host_rate}))
+            return bucket
+
+    def wait(self, target):
+        """Blocks until the target's bucket allows another request (target is a URL or a name)"""
+        return self.bucket(target).acquire()
+
+    def observe(self, target, latency, status=200):
+        self.bucket(target).observe(latency, status)
+
+    def backoff(self, target, attempt, retry_after=None, base=1.0, cap=60.0):
+        """Sleeps before retry number attempt (1-based), honouring Retry-After when given"""
+        delay = retry_after if retry_after is not None else min(cap, base * 2 ** (attempt - 1)) * (0.5 + random.random() / 2)
+        self.bucket(target).pause(delay)
+        metrics.sleep(delay, "backoff")
+
+
+# One scheduler for the whole process
+scheduler = RateScheduler()
+# Google Sheets allows 60 write requests per minute per user
+scheduler.configure("sheets", rate=1.0, capacity=10, max_rate=1.0)
@@ -0,0 +1,111 @@
+import json
+import os
+from statistics import median
+from logger import setup_logger
+
+logger = setup_logger()
+
+
+def parse_shard(text):
+    """"2/4" -> (2, 4); shards are numbered from 1"""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N, got {text!r}")
+    if not 1 <= index <= count:
+        raise ValueError(f"Shard {index} is outside 1..{count}")
+    return index, count
+
+
+def assign_shards(counties, shard_count, runtimes=None):
+    """Splits counties into shard_count lists of roughly equal total runtime.
+
+    Longest county first onto the least loaded shard, ties broken by name and shard
+    number, so every runner computes the same split from the same history. Counties
+    without history count as the median known runtime.
+    """
+    runtimes = runtimes or {}
+    known = [runtimes[county] for county in counties if county in runtimes]
+    default = median(known) if known else 1.0
+
+    shards = [[] for _ in range(shard_count)]
+    loads = [0.0] * shard_count
+    for county in sorted(counties, key=lambda county: (-runtimes.get(county, default), county)):
+        target = min(range(shard_count), key=lambda n: (loads[n], n))
+        shards[target].append(county)
+        loads[target] += runtimes.get(county, default)
+    return shards
+
+
+def shard_counties(counties, index, count, runtimes=None):
+    """Counties for shard index of count (1-based), longest first"""
+    return assign_shards(counties, count, runtimes)[index - 1]
+
+
+def write_plan(path, counties, shard_count, runtimes=None):
+    """Saves the county split for every shard of a run, so all shards use the same one"""
+    plan = {"shard_count": shard_count, "shards": assign_shards(counties, shard_count, runtimes)}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(plan, f, indent=2)
+    for index, shard in enumerate(plan["shards"], start=1):
+        logger.info(f"Plan: shard {index}/{shard_count} gets {len(shard)} counties: {', '.join(shard)}")
+    return plan
+
+
+def load_plan(path, index, count):
+    """Counties of shard index of count (1-based) from a plan written by write_plan"""
+    with open(path, encoding="utf-8") as f:
+        plan = json.load(f)
+    if plan["shard_count"] != count:
+        raise ValueError(f"{path} splits counties into {plan['shard_count']} shards, not {count}")
+    return plan["shards"][index - 1]
+
+
+def artifact_path(directory, index, count):
+    return os.path.join(directory, f"shard-{index}-of-{count}.json")
+
+
+def write_artifact(path, store, shard, run_started, county_list, completed_counties, county_seconds):
+    """Saves what a shard saw for the merge step: its auctions, day fingerprints and runtimes.
+
+    Auctions come from every county of the shard, finished or not, as the unsharded run keeps
+    them too; completed_counties only limits which counties the merge may sweep.
+    """
+    completed = sorted(set(completed_counties) & set(county_list))
+    artifact = {
+        "shard": shard,
+        "run_started": run_started,
+        "counties": sorted(county_list),
+        "completed_counties": completed,
+        "auctions": store.seen_since(run_started, county_list),
+        "fingerprints": store.fingerprints_since(run_started, county_list),
+        "county_seconds": {county: county_seconds[county] for county in completed if county in county_seconds},
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(artifact, f)
+    os.replace(tmp_path, path)
+    logger.info(f"Shard {shard}: {len(artifact['auctions'])} auctions, "
+                f"{len(completed)}/{len(county_list)} counties complete, written to {path}")
+    return path
+
+
+def merge_artifacts(store, paths, merged_at):
+    """Applies every shard artifact to store as seen at merged_at; returns the counties they completed.
+
+    Only those counties may be swept afterwards: a shard that failed or never uploaded
+    must not cancel the auctions of its counties.
+    """
+    completed = set()
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            artifact = json.load(f)
+        store.import_auctions(artifact["auctions"], merged_at)
+        store.import_fingerprints(artifact["fingerprints"])
+        store.save_runtimes(artifact["county_seconds"], merged_at)
+        completed.update(artifact["completed_counties"])
+        logger.info(f"Merged shard {artifact['shard']}: {len(artifact['auctions'])} auctions, "
+                    f"{len(artifact['completed_counties'])}/{len(artifact['counties'])} counties complete")
+    return completed
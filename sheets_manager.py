@@ -1,32 +1,121 @@
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
+import re
+import time
+from bisect import bisect_left
 from datetime import datetime
 from logger import setup_logger
+from metrics import metrics
+from scheduler import parse_retry_after, scheduler
 from gspread_formatting import *
 
 
+ADDRESS_ABBREVIATIONS = {
+    "street": "st", "avenue": "ave", "road": "rd", "drive": "dr", "boulevard": "blvd",
+    "lane": "ln", "court": "ct", "place": "pl", "circle": "cir", "terrace": "ter",
+    "parkway": "pkwy", "highway": "hwy", "square": "sq", "trail": "trl", "apartment": "apt",
+    "suite": "ste", "north": "n", "south": "s", "east": "e", "west": "w",
+    "northeast": "ne", "northwest": "nw", "southeast": "se", "southwest": "sw",
+}
+
+
+def normalize_address(address):
+    """Lowercases, drops punctuation, collapses whitespace and abbreviates common street words"""
+    words = re.sub(r"[.,#]", " ", str(address).lower()).split()
+    return " ".join(ADDRESS_ABBREVIATIONS.get(word, word) for word in words)
+
+
+def create_auction_key(row):
+    """Creates unique key from auction data ("Auction Date" as MM-DD-YYYY, "County", "Address")"""
+    auction_date = datetime.strptime(str(row['Auction Date']).strip(), "%m-%d-%Y").strftime("%m-%d-%Y")
+    return f"{auction_date}_{str(row['County']).strip().lower()}_{normalize_address(row['Address'])}"
+
+
 class SheetsManager:
-    def __init__(self, json_keyfile, spreadsheet_name):
-        self.logger = setup_logger()
+    max_attempts = 5  # per API call when the quota is exceeded
+
+    def __init__(self, json_keyfile, spreadsheet_name, batch_mode=False, limiter=scheduler):
+        """Only stores the settings; authentication and the first sheet read happen on first use"""
+        self._init_state(batch_mode, limiter)
+        self.json_keyfile = json_keyfile
+        self.spreadsheet_name = spreadsheet_name
         self.scope = [
             "https://spreadsheets.google.com/feeds",
             "https://www.googleapis.com/auth/drive"
         ]
+
+    @property
+    def sheet(self):
+        if self._sheet is None:
+            self._connect()
+        return self._sheet
+
+    def _connect(self):
         try:
-            self.creds = ServiceAccountCredentials.from_json_keyfile_name(json_keyfile, self.scope)
+            self.creds = ServiceAccountCredentials.from_json_keyfile_name(self.json_keyfile, self.scope)
             self.client = gspread.authorize(self.creds)
-            self.sheet = self.client.open(spreadsheet_name).sheet1
+            self._sheet = self.client.open(self.spreadsheet_name).sheet1
 
-            if not self.sheet.row_values(1):
-                self.sheet.append_row(["Auction Date", "County", "Address", "Link"])
+            if not self._call("row_values", self._sheet.row_values, 1):
+                self._call("append_row", self._sheet.append_row, ["Auction Date", "County", "Address", "Link"])
                 self._setup_sheet()
 
             self.clear_all_highlights()
 
         except Exception as e:
+            self._sheet = None
             self.logger.error(f"Initialization failed: {str(e)}", exc_info=True)
             raise
 
+    def _init_state(self, batch_mode, limiter):
+        self.logger = setup_logger()
+        # Rate scheduler holding API calls to the Sheets quota; None to call straight through
+        self.limiter = limiter
+        self._sheet = None
+        # In batch mode the sheet is read once, new rows are buffered and written by flush()
+        self.batch_mode = batch_mode
+        self._pending_rows = []
+        # {auction_key: row_number}, read from the sheet once and kept in step with our own writes.
+        # The keys are always current; after a sort only the row numbers are stale
+        self._index = None
+        self._index_stale = False
+
+    @classmethod
+    def from_worksheet(cls, sheet, batch_mode=False, limiter=scheduler):
+        """Wraps an already opened worksheet (or a stand-in with the same API) without authenticating"""
+        manager = cls.__new__(cls)
+        manager._init_state(batch_mode, limiter)
+        manager._sheet = sheet
+        return manager
+
+    def _call(self, name, fn, *args, **kwargs):
+        """Runs one Sheets API call under the quota limiter, timed and counted for the run metrics"""
+        for attempt in range(1, self.max_attempts + 1):
+            if self.limiter is not None:
+                self.limiter.wait("sheets")
+            metrics.count("sheets_api_calls")
+            metrics.count(f"sheets.{name}")
+            start = time.perf_counter()
+            try:
+                with metrics.timer(f"sheets.{name}"):
+                    result = fn(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                status = e.response.status_code
+                if self.limiter is not None:
+                    self.limiter.observe("sheets", time.perf_counter() - start, status)
+                if status != 429 or attempt == self.max_attempts:
+                    raise
+                retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                self.logger.info(f"Sheets quota hit on {name}, retry {attempt}")
+                if self.limiter is not None:
+                    self.limiter.backoff("sheets", attempt, retry_after=retry_after)
+                else:
+                    metrics.sleep(retry_after or 2 ** (attempt - 1), "backoff")
+                continue
+            if self.limiter is not None:
+                self.limiter.observe("sheets", time.perf_counter() - start)
+            return result
+
     def _setup_sheet(self):
         """Configures sheet formatting and sorting"""
         try:
@@ -34,10 +123,10 @@ class SheetsManager:
                 backgroundColor=Color(0.2, 0.6, 0.8),
                 textFormat=TextFormat(bold=True, foregroundColor=Color(1, 1, 1))  # Added missing parenthesis
             )
-            format_cell_range(self.sheet, "A1:D1", header_fmt)
+            self._call("format", format_cell_range, self.sheet, "A1:D1", header_fmt)
 
-            self.sheet.freeze(rows=1)
-            self.sheet.sort((1, 'asc'))
+            self._call("freeze", self.sheet.freeze, rows=1)
+            self._call("sort", self.sheet.sort, (1, 'asc'))
         except Exception as e:
             self.logger.error(f"Sheet setup failed: {str(e)}", exc_info=True)
             raise
@@ -49,65 +138,171 @@ class SheetsManager:
                 backgroundColor=Color(1, 1, 1),
                 textFormat=TextFormat(bold=False))
 
-            if len(self.sheet.get_all_values()) > 1:
-                format_cell_range(
-                    self.sheet,
-                    f"A2:D{len(self.sheet.get_all_values())}",
-                    default_fmt)
+            # The grid size comes with the worksheet metadata, so no values have to be read
+            if self.sheet.row_count > 1:
+                self._call("format", format_cell_range, self.sheet, f"A2:D{self.sheet.row_count}", default_fmt)
         except Exception as e:
             self.logger.error(f"Failed to clear highlights: {str(e)}")
 
     def _highlight_new_row(self, row_number):
         """Applies highlight formatting to new rows"""
+        self._highlight_rows(row_number, row_number)
+
+    def _highlight_rows(self, first_row, last_row):
+        """Applies highlight formatting to a block of new rows in one request"""
         try:
             new_row_fmt = CellFormat(
                 backgroundColor=Color(1, 1, 0.7),
                 textFormat=TextFormat(bold=True),
                 borders=Borders(
                     top=Border("SOLID_THICK", Color(0, 0, 0))))
-            format_cell_range(self.sheet, f"A{row_number}:D{row_number}", new_row_fmt)
+            self._call("format", format_cell_range, self.sheet, f"A{first_row}:D{last_row}", new_row_fmt)
         except Exception as e:
-            self.logger.error(f"Failed to highlight row {row_number}: {str(e)}")
+            self.logger.error(f"Failed to highlight rows {first_row}-{last_row}: {str(e)}")
+
+    def _load_index(self):
+        """Index for key lookups; the sheet is read only the first time"""
+        if self._index is None:
+            self._index_records(self._call("get_all_records", self.sheet.get_all_records))
+        return self._index
+
+    def _row_index(self):
+        """Index with current row numbers, re-read only if a sort has moved rows since the last read"""
+        if self._index is None or self._index_stale:
+            self._index_records(self._call("get_all_records", self.sheet.get_all_records))
+        return self._index
+
+    def _index_records(self, records):
+        # Rows buffered for flush() aren't on the sheet yet; keep them so they still dedupe
+        pending = {key for key, row_num in (self._index or {}).items() if row_num is None}
+        self._index = dict.fromkeys(pending)
+        for i, row in enumerate(records, start=2):  # +2 for header and 1-based index
+            try:
+                self._index[self._create_auction_key(row)] = i
+            except (ValueError, KeyError) as e:
+                # Out of the index, so no sync or expiry sweep will ever remove it; needs a fix by hand
+                self.logger.warning(f"Sheet row {i} has no valid auction key and is left untouched: {str(e)}")
+                metrics.count("sheets_unparsed_rows")
+        self._index_stale = False
+
+    def get_auction_records(self):
+        """Every row as a {"Auction Date", "County", "Address", "Link"} dict; the same read refreshes the index"""
+        records = self._call("get_all_records", self.sheet.get_all_records)
+        self._index_records(records)
+        return records
 
     def add_auction(self, date, county, address, link):
         """Adds and highlights new auctions"""
+        if self.batch_mode:
+            return self._buffer_auction(date, county, address, link)
         try:
-            existing = self.sheet.get_all_records()
-            new_date = datetime.strptime(date, "%m-%d-%Y")
+            index = self._load_index()
+            key = self._create_auction_key({"Auction Date": date, "County": county, "Address": address})
+            if key in index:
+                return False
 
-            is_duplicate = any(
-                datetime.strptime(row["Auction Date"], "%m-%d-%Y") == new_date
-                and row["Address"].strip().lower() == address.strip().lower()
-                for row in existing
-            )
-
-            if not is_duplicate:
-                self.sheet.append_row([date, county, address, link])
-                new_row_num = len(self.sheet.get_all_values())
-                self._highlight_new_row(new_row_num)
-                self.sheet.sort((1, 'asc'))
-                return True
+            response = self._call("append_row", self.sheet.append_row, [date, county, address, link])
+            new_row_num = self._appended_rows(response)[0]
+            self._highlight_new_row(new_row_num)
+            self._call("sort", self.sheet.sort, (1, 'asc'))
+            index[key] = new_row_num
+            # The sort moved rows around; only row numbers are re-read, and only when they are needed
+            self._index_stale = True
+            return True
+        except Exception as e:
+            self.logger.error(f"Error adding auction: {str(e)}")
             return False
+
+    def _buffer_auction(self, date, county, address, link):
+        """Batch mode add_auction: dedupes against the index and queues the row for flush()"""
+        try:
+            index = self._load_index()
+            key = self._create_auction_key({"Auction Date": date, "County": county, "Address": address})
+            if key in index:
+                return False
+            index[key] = None  # Row number is known once flush() appends it
+            self._pending_rows.append([date, county, address, link])
+            return True
         except Exception as e:
             self.logger.error(f"Error adding auction: {str(e)}")
             return False
 
+    def _appended_rows(self, response):
+        """First and last row number written by an append call"""
+        # e.g. "Sheet1!A120:D134" - appended rows are contiguous at the bottom
+        updated_range = response["updates"]["updatedRange"].split("!")[-1]
+        cells = updated_range.split(":")
+        first_row, last_row = (int(cell.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")) for cell in (cells[0], cells[-1]))
+        return first_row, last_row
+
+    def flush(self):
+        """Writes buffered rows with one append, one highlight request and one sort"""
+        if not self._pending_rows:
+            return 0
+        rows = self._pending_rows
+        try:
+            response = self._call("append_rows", self.sheet.append_rows, rows)
+            self._pending_rows = []
+            first_row, last_row = self._appended_rows(response)
+            self._highlight_rows(first_row, last_row)
+            self._call("sort", self.sheet.sort, (1, 'asc'))
+            self._index_stale = True
+            self.logger.info(f"Added {len(rows)} new auctions")
+            return len(rows)
+        except Exception as e:
+            self.logger.error(f"Failed to write {len(rows)} buffered auctions: {str(e)}", exc_info=True)
+            return 0
+
+    @staticmethod
+    def _merge_row_ranges(row_numbers):
+        """Collapses row numbers into contiguous (first, last) ranges, bottom range first"""
+        ranges = []
+        for row_num in sorted(row_numbers):
+            if ranges and ranges[-1][1] == row_num - 1:
+                ranges[-1][1] = row_num
+            else:
+                ranges.append([row_num, row_num])
+        return [tuple(r) for r in reversed(ranges)]
+
+    def remove_rows(self, row_numbers):
+        """Deletes the given sheet rows in a single batchUpdate and keeps the index in step"""
+        row_numbers = set(row_numbers)
+        if not row_numbers:
+            return 0
+        # Row numbers must be current to know which keys go away
+        index = self._row_index()
+        # Requests run in order, so deleting from the bottom keeps the other ranges valid
+        self._call("batch_update", self.sheet.spreadsheet.batch_update, {"requests": [
+            {"deleteDimension": {"range": {
+                "sheetId": self.sheet.id,
+                "dimension": "ROWS",
+                "startIndex": first_row - 1,  # 0-based, end exclusive
+                "endIndex": last_row,
+            }}}
+            for first_row, last_row in self._merge_row_ranges(row_numbers)
+        ]})
+
+        deleted = sorted(row_numbers)
+        remaining = {}
+        for key, row_num in index.items():
+            if row_num is None:
+                remaining[key] = None
+            elif row_num not in row_numbers:
+                # Shift up by the number of deleted rows above this one
+                remaining[key] = row_num - bisect_left(deleted, row_num)
+        self._index = remaining
+        return len(row_numbers)
+
     def remove_expired_auctions(self):
         """Deletes rows where auction date is older than today"""
         try:
             today = datetime.now().date()
-            records = self.sheet.get_all_records()
-            rows_to_delete = []
-
-            # Check each row (starting from row 2)
-            for i, row in enumerate(records, start=2):
-                auction_date = datetime.strptime(row["Auction Date"], "%m-%d-%Y").date()
-                if auction_date < today:
-                    rows_to_delete.append(i)
-
-            # Delete from bottom to avoid index shifting
-            for row_num in sorted(rows_to_delete, reverse=True):
-                self.sheet.delete_rows(row_num)
+            index = self._row_index()
+            rows_to_delete = [
+                row_num for key, row_num in index.items()
+                if row_num is not None and datetime.strptime(key.split("_", 1)[0], "%m-%d-%Y").date() < today
+            ]
+            self.remove_rows(rows_to_delete)
 
             self.logger.info(f"Removed {len(rows_to_delete)} expired auctions")
             return len(rows_to_delete)
@@ -118,12 +313,8 @@ class SheetsManager:
 
     def get_existing_auctions(self):
         """Returns dict of {auction_key: row_number} for all current auctions"""
-        records = self.sheet.get_all_records()
-        return {
-            self._create_auction_key(row): i + 2  # +2 for header and 1-based index
-            for i, row in enumerate(records)
-        }
+        return {key: row_num for key, row_num in self._row_index().items() if row_num is not None}
 
     def _create_auction_key(self, row):
         """Creates unique key from auction data"""
-        return f"{row['Auction Date']}_{row['County'].lower()}_{row['Address'].strip().lower()}"
+        return create_auction_key(row)
@@ -0,0 +1,99 @@
+import csv
+import json
+import os
+import threading
+from datetime import datetime
+from logger import setup_logger
+from metrics import metrics
+from auction_store import sync_to_sheet
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet output is optional
+    pyarrow = None
+
+# Every field an exported record carries, in column order
+EXPORT_FIELDS = [
+    "date", "county", "address", "case_number", "item_id", "appraised_value", "opening_bid", "deposit",
+    "status", "status_detail", "tax_sale", "reason", "link", "scraped_at",
+]
+
+
+class JsonlSink:
+    """Streams every parsed auction item to exports/<run date>/listings.jsonl as it is scraped.
+
+    Sold, cancelled and incomplete items are included with tax_sale left empty. The file is
+    append-only, so a resumed run keeps adding to it; close() compacts it into
+    one row per listing as listings.csv or listings.parquet next to it.
+    """
+
+    def __init__(self, directory="exports", run_date=None, compact_format="csv"):
+        if compact_format == "parquet" and pyarrow is None:
+            raise ValueError("Parquet export needs pyarrow (pip install pyarrow)")
+        self.logger = setup_logger()
+        self.run_dir = os.path.join(directory, run_date or datetime.now().date().isoformat())
+        self.compact_format = compact_format
+        os.makedirs(self.run_dir, exist_ok=True)
+        self.path = os.path.join(self.run_dir, "listings.jsonl")
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, listing):
+        record = {field: listing.get(field) for field in EXPORT_FIELDS}
+        record["scraped_at"] = datetime.now().isoformat(timespec="seconds")
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+        metrics.count("exported")
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+        with metrics.timer("export.compact"):
+            path = self.compact()
+        self.logger.info(f"Export compacted to {path}")
+
+    def read_records(self):
+        """Latest record per listing; a listing seen twice (e.g. before and after a resume) keeps its last copy"""
+        records = {}
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line of an interrupted run
+                records[(record["date"], record["county"], record["item_id"], record["case_number"])] = record
+        return sorted(records.values(), key=lambda record: (record["county"], record["date"], record["address"]))
+
+    def compact(self):
+        records = self.read_records()
+        if self.compact_format == "parquet":
+            path = os.path.join(self.run_dir, "listings.parquet")
+            columns = {field: [record[field] for record in records] for field in EXPORT_FIELDS}
+            pyarrow.parquet.write_table(pyarrow.table(columns), path)
+            return path
+
+        path = os.path.join(self.run_dir, "listings.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+        return path
+
+
+class SheetSink:
+    """Brings the Google Sheet in line with the store's active auctions when the run ends"""
+
+    def __init__(self, store, sheets):
+        self.logger = setup_logger()
+        self.store = store
+        self.sheets = sheets
+
+    def write(self, listing):
+        pass  # The sheet is synced from the store, which already has every tax sale
+
+    def close(self):
+        with metrics.timer("sheets.sync"):
+            added, removed = sync_to_sheet(self.store, self.sheets)
+        self.logger.info(f"Sheet synced: {added} rows added, {removed} rows removed")
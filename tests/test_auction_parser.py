@@ -0,0 +1,94 @@
+import json
+import os
+from datetime import date
+from auction_parser import (
+    build_listings, decode_ret_html, parse_auction_items, parse_calendar_days, parse_max_pages,
+    INCOMPLETE, NOT_UPCOMING,
+)
+from classifier import BID_NOT_TWO_THIRDS, MORTGAGE, NO_APPRAISAL
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+AUCTION_DATE = date(2025, 7, 7)
+LINK = "https://cuyahoga.sheriffsaleauction.ohio.gov/index.cfm?zaction=AUCTION&AUCTIONDATE=07/07/2025"
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def day_items():
+    return parse_auction_items(read_fixture("auction_day.html"))
+
+
+def page_2_html():
+    return decode_ret_html(json.loads(read_fixture("auction_page_2.json"))["retHTML"])
+
+
+def test_calendar_days():
+    assert parse_calendar_days(read_fixture("calendar.html")) == [
+        date(2025, 7, 7), date(2025, 7, 14), date(2025, 7, 21)]
+
+
+def test_max_pages():
+    assert parse_max_pages(read_fixture("auction_day.html")) == 2
+    assert parse_max_pages(page_2_html()) is None
+
+
+def test_auction_items():
+    items = day_items()
+    assert [item["item_id"] for item in items] == ["100201", "100202", "100203"]
+    assert items[0] == {
+        "item_id": "100201",
+        "status_label": "Auction Starts",
+        "status_value": "07/07/2025 09:01 AM ET",
+        "cells": ["SHERIFF SALE", "CV-24-100201", "010-02-0031", "1418 WEST 65TH ST", "CLEVELAND, 44102",
+                  "$45,000.00", "$1,250.00", "$2,000.00"],
+    }
+    assert items[1]["cells"][5:] == ["$90,000.00", "$60,000.00", "$5,000.00"]
+    assert (items[2]["status_label"], items[2]["status_value"]) == ("Auction Status", "Cancelled per Plaintiff")
+
+
+def test_decode_ret_html():
+    html = page_2_html()
+    assert "@" not in html
+    assert parse_auction_items(html) == [{
+        "item_id": "100204",
+        "status_label": "Auction Starts",
+        "status_value": "07/07/2025 09:01 AM ET",
+        "cells": ["SHERIFF SALE", "CV-24-100204", "010-03-0001", "902 E 185TH ST", "CLEVELAND, 44119",
+                  "$0.00", "$3,412.55", "$2,000.00"],
+    }]
+
+
+def test_build_listings():
+    items = day_items() + parse_auction_items(page_2_html())
+    listings = build_listings(items, AUCTION_DATE, "cuyahoga", LINK)
+    assert [(listing["item_id"], listing["tax_sale"], listing["reason"]) for listing in listings] == [
+        ("100201", True, BID_NOT_TWO_THIRDS),
+        ("100202", False, MORTGAGE),
+        ("100203", None, NOT_UPCOMING),
+        ("100204", True, NO_APPRAISAL),
+    ]
+    assert listings[0] == {
+        "date": "07-07-2025",
+        "county": "cuyahoga",
+        "address": "1418 WEST 65TH ST CLEVELAND, 44102",
+        "link": LINK,
+        "case_number": "CV-24-100201",
+        "appraised_value": 45000.0,
+        "opening_bid": 1250.0,
+        "deposit": "2000.00",
+        "status": "Auction Starts",
+        "status_detail": "07/07/2025 09:01 AM ET",
+        "item_id": "100201",
+        "tax_sale": True,
+        "reason": BID_NOT_TWO_THIRDS,
+    }
+    assert listings[2]["status"] == "Status Cancelled"
+
+
+def test_build_listings_incomplete_item():
+    item = dict(day_items()[0], cells=["SHERIFF SALE", "CV-24-100201"])
+    listing, = build_listings([item], AUCTION_DATE, "cuyahoga", LINK)
+    assert (listing["tax_sale"], listing["reason"]) == (None, INCOMPLETE)
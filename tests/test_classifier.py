@@ -0,0 +1,108 @@
+import pytest
+from auction_store import AuctionStore
+from classifier import (
+    BID_NOT_TWO_THIRDS, DEFAULT_RULES, MORTGAGE, NO_APPRAISAL, OTHER_DEPOSIT, Classifier,
+)
+
+# 2/3 of it is 60000.666..., so every rounding variant gives a different opening bid
+APPRAISED = 90001.0
+EXPECTED = APPRAISED * 2 / 3
+
+
+def classify_one(appraised, opening_bid, deposit, county=None, classifier=None):
+    tax_sale, reasons = (classifier or Classifier()).classify([appraised], [opening_bid], [deposit], [county])
+    return bool(tax_sale[0]), reasons[0]
+
+
+@pytest.mark.parametrize("decimals, offset", DEFAULT_RULES["bid_variants"])
+def test_each_bid_variant_is_a_mortgage(decimals, offset):
+    # Amounts arrive as the page prints them, with two decimals
+    opening_bid = float(f"{round(EXPECTED, decimals) + offset:.2f}")
+    assert classify_one(APPRAISED, opening_bid, "5000.00") == (False, MORTGAGE)
+
+
+def test_other_opening_bid_is_a_tax_sale():
+    assert classify_one(APPRAISED, 1250.0, "5000.00") == (True, BID_NOT_TWO_THIRDS)
+
+
+def test_tolerance():
+    opening_bid = round(EXPECTED, 2)
+    assert classify_one(APPRAISED, opening_bid + 0.004, "5000.00") == (False, MORTGAGE)
+    assert classify_one(APPRAISED, opening_bid + 0.01, "5000.00") == (True, BID_NOT_TWO_THIRDS)
+
+    loose = Classifier(rules={"tolerance": 0.02})
+    assert classify_one(APPRAISED, opening_bid + 0.01, "5000.00", classifier=loose) == (False, MORTGAGE)
+
+
+@pytest.mark.parametrize("deposit", ["$5,000.00", "5000.00", "5000", 5000, 5000.0])
+def test_standard_deposit_as_string_or_number(deposit):
+    assert classify_one(APPRAISED, round(EXPECTED, 2), deposit) == (False, MORTGAGE)
+
+
+@pytest.mark.parametrize("deposit", ["$7,500.00", 7500.0])
+def test_other_deposit_is_a_tax_sale(deposit):
+    assert classify_one(APPRAISED, round(EXPECTED, 2), deposit) == (True, OTHER_DEPOSIT)
+
+
+@pytest.mark.parametrize("deposit", [None, "", "n/a", float("nan")])
+def test_unreadable_deposit_is_a_tax_sale(deposit):
+    assert classify_one(APPRAISED, round(EXPECTED, 2), deposit) == (True, OTHER_DEPOSIT)
+
+
+def test_no_appraisal_is_a_tax_sale():
+    assert classify_one(0.0, 0.0, "5000.00") == (True, NO_APPRAISAL)
+
+
+def test_county_rules_override():
+    classifier = Classifier(county_rules={"cuyahoga": {"deposits": [25000.0]}})
+    opening_bid = round(EXPECTED, 2)
+    tax_sale, reasons = classifier.classify([APPRAISED] * 4, [opening_bid] * 4,
+                                            ["25000.00", "5000.00", "25000.00", "5000.00"],
+                                            ["cuyahoga", "cuyahoga", "summit", "summit"])
+    assert tax_sale.tolist() == [False, True, True, False]
+    assert reasons == [MORTGAGE, OTHER_DEPOSIT, OTHER_DEPOSIT, MORTGAGE]
+
+
+def test_classify_listings():
+    listings = [
+        {"appraised_value": APPRAISED, "opening_bid": round(EXPECTED), "deposit": "2000.00", "county": "adams"},
+        {"appraised_value": APPRAISED, "opening_bid": 100.0, "deposit": "2000.00", "county": "adams"},
+    ]
+    tax_sale, reasons = Classifier().classify_listings(listings)
+    assert tax_sale.tolist() == [False, True]
+    assert reasons == [MORTGAGE, BID_NOT_TWO_THIRDS]
+
+
+def store_listing(store, address, deposit, tax_sale, reason):
+    store.upsert({"date": "12-01-2099", "county": "adams", "address": address, "link": "", "case_number": address,
+                  "appraised_value": APPRAISED, "opening_bid": round(EXPECTED, 2), "deposit": deposit,
+                  "tax_sale": tax_sale, "reason": reason}, "2099-01-01T00:00:00")
+
+
+def statuses(store):
+    return {row["address"]: (row["status"], row["reason"])
+            for row in store.conn.execute("SELECT address, status, reason FROM auctions")}
+
+
+def test_reclassify_moves_rows_between_active_and_excluded():
+    store = AuctionStore(":memory:")
+    store_listing(store, "1 TAX ST", "7500.00", True, OTHER_DEPOSIT)
+    store_listing(store, "2 MORTGAGE ST", "5000.00", False, MORTGAGE)
+    store_listing(store, "3 TAX ST", "7500.00", True, OTHER_DEPOSIT)
+    # Seeded from the sheet: no classifier inputs, so reclassify leaves it alone
+    store.seed_from_sheet([{"Auction Date": "12-01-2099", "County": "adams", "Address": "4 SEEDED ST"}])
+
+    # 7500 becomes a standard deposit and 5000 no longer is
+    assert store.reclassify(Classifier(rules={"deposits": [7500.0]})) == (2, 1)
+    assert statuses(store) == {
+        "1 TAX ST": ("excluded", MORTGAGE),
+        "2 MORTGAGE ST": ("active", OTHER_DEPOSIT),
+        "3 TAX ST": ("excluded", MORTGAGE),
+        "4 SEEDED ST": ("active", None),
+    }
+
+    # And back under the default rules
+    assert store.reclassify(Classifier()) == (1, 2)
+    assert statuses(store)["2 MORTGAGE ST"] == ("excluded", MORTGAGE)
+    assert statuses(store)["1 TAX ST"] == ("active", OTHER_DEPOSIT)
+    assert store.reclassify(Classifier()) == (0, 0)
@@ -0,0 +1,19 @@
+import time
+from email.utils import formatdate
+import pytest
+from scheduler import parse_retry_after
+
+
+@pytest.mark.parametrize("value, seconds", [("30", 30.0), ("1.5", 1.5), (" 2 ", 2.0), ("-3", 0.0)])
+def test_retry_after_seconds(value, seconds):
+    assert parse_retry_after(value) == seconds
+
+
+def test_retry_after_http_date():
+    assert 50 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+@pytest.mark.parametrize("value", [None, "", "soon", "nan", "inf"])
+def test_unreadable_retry_after(value):
+    assert parse_retry_after(value) is None